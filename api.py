@@ -1,20 +1,45 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+import os
+import time
+
+# Measured from here to the end of startup and reported as the cold-start time
+_IMPORT_START = time.perf_counter()
+
+def _restart_cold_start_clock():
+    """Time a forked worker (e.g. gunicorn with preload_app) from its fork."""
+    global _IMPORT_START
+    _IMPORT_START = time.perf_counter()
+
+os.register_at_fork(after_in_child=_restart_cold_start_clock)
+
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import Response, JSONResponse, StreamingResponse
 from pydantic import BaseModel
-import time
 import re
+import json
+import codecs
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
-import uvicorn
-import os
-from text_utils import preprocess_text, extract_features, summarize_text
-from radix_sort import radix_sort_numeric, radix_sort_strings
-from file_processor import extract_text_from_pdf, extract_text_from_excel, generate_pdf_report, generate_excel_report, generate_csv_report
+import uuid
+from collections import Counter
+from text_utils import build_vocabulary, summarize_text, ngram_bounds, extract_numbers_from_text, format_number, SUMMARY_ENGINES
+from radix_sort import radix_topk, sort_features, SORT_ORDERS
+from sort_dispatcher import adaptive_sort, get_calibration
+import file_processor
+import text_utils
+from file_processor import extract_text_from_pdf, extract_text_from_excel, generate_pdf_report, generate_excel_report, iter_features_csv, iter_text_report, iter_ndjson_report, generate_parquet_report, generate_arrow_report, PDF_MAX_FEATURES
+from worker_pool import shutdown_worker_pool
+from result_cache import get_result_cache, get_result_store, make_key
 from fastapi.staticfiles import StaticFiles
-import nltk
 
 app = FastAPI(title="ML Data Convertor API")
 
+# Uploads larger than this are rejected with 413
+MAX_UPLOAD_BYTES = int(os.environ.get("NLP_MAX_UPLOAD_BYTES", str(100 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
 # Ensure static directory exists
 if not os.path.exists("static"):
     os.makedirs("static", exist_ok=True)
@@ -32,106 +57,334 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Reject oversized uploads from their Content-Length, before the body is spooled."""
+    if request.url.path == "/api/upload-file":
+        length = request.headers.get("content-length", "")
+        # Allow some room for the multipart boundaries and form fields
+        if length.isdigit() and int(length) > MAX_UPLOAD_BYTES + 64 * 1024:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"Upload exceeds the {MAX_UPLOAD_BYTES} byte limit"}
+            )
+    return await call_next(request)
+
+# CPU-bound stages (extraction, sorting, summaries, report rendering) run on
+# this executor so the event loop keeps serving other requests, /api/health
+# included. Threads avoid pickling request text; large sorts and long
+# summaries already fan out to the worker_pool processes from there.
+CPU_WORKERS = int(os.environ.get("NLP_CPU_WORKERS", str(min(32, (os.cpu_count() or 1) + 4))))
+# Requests waiting for a CPU slot beyond this many are turned away with 503
+MAX_QUEUED_REQUESTS = int(os.environ.get("NLP_MAX_QUEUED_REQUESTS", "64"))
+
+_cpu_executor = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="nlp-cpu")
+_cpu_slots = asyncio.Semaphore(CPU_WORKERS)
+_cpu_load = {"running": 0, "queued": 0}
+
+async def run_cpu_bound(func, *args, **kwargs):
+    """Run a blocking function on the CPU executor, with backpressure.
+    
+    At most CPU_WORKERS calls run at once; callers beyond that wait for a
+    slot, and once MAX_QUEUED_REQUESTS are waiting new calls get a 503.
+    """
+    if _cpu_load["queued"] >= MAX_QUEUED_REQUESTS:
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    
+    _cpu_load["queued"] += 1
+    try:
+        await _cpu_slots.acquire()
+    finally:
+        _cpu_load["queued"] -= 1
+    
+    _cpu_load["running"] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_cpu_executor, functools.partial(func, *args, **kwargs))
+    finally:
+        _cpu_load["running"] -= 1
+        _cpu_slots.release()
+
 # Models for request/response
 class ProcessTextRequest(BaseModel):
-    text: str
+    text: Optional[str] = None  # Required unless result_id is given
     feature_type: str = "numbers"  # 'words', 'sentences', 'ngrams', 'numbers'
     ngram_size: int = 2
+    ngram_range: Optional[List[int]] = None  # [min_n, max_n]; overrides ngram_size
     base: int = 10
     summarize: bool = False
     summary_ratio: float = 0.2  # Percentage of original text to keep in summary
+    summary_engine: Optional[str] = None  # 'summa' or 'textrank' (sparse, for long documents)
+    sort_by: str = "lexicographic"  # 'lexicographic', 'frequency', 'length'
+    preview_limit: Optional[int] = None  # Only sort and return the first N features
+    result_id: Optional[str] = None  # Result of an earlier /api/process call; export endpoints use it instead of text
 
 class ProcessResponse(BaseModel):
     sorted_features: List[str]
     processing_time: float
     feature_count: int
     summary: Optional[str] = None
+    feature_counts: Optional[List[int]] = None  # Occurrences of each sorted feature
+    sort_strategy: Optional[str] = None  # Sorting strategy picked for the input
+    result_id: Optional[str] = None  # Handle for the export endpoints
 
-# Add this near the top of your api.py file, before any text processing is done
-try:
-    # Try to find the punkt tokenizer
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    # If not found, download it
-    print("Downloading required NLTK data...")
-    nltk.download('punkt')
-
-# Add this near the top of your api.py file, after the existing NLTK download code
-try:
-    # Try to find the punkt_tab tokenizer
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    # If not found, download it
-    print("Downloading required NLTK punkt_tab data...")
+def parse_ngram_range(value):
+    """Parse an n-gram range form field such as '1-4' or '1,4'."""
+    if not value:
+        return None
     try:
-        nltk.download('punkt_tab')
-    except:
-        # Some systems don't have punkt_tab as a separate download
-        print("Could not download punkt_tab directly, will try to fix in code")
-
-def extract_numbers_from_text(text):
-    """Extract all numbers from text."""
-    number_strings = re.findall(r'-?\d+(?:\.\d+)?', text)
+        return [int(part) for part in re.split(r'[-,:]', value, maxsplit=1)]
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid ngram_range: {value}")
+
+def sort_request_features(request: ProcessTextRequest, ngram_size, limit: Optional[int] = None, source=None):
+    """Extract and sort the features of a request (the cacheable part of compute_features).
     
-    numbers = []
-    for num_str in number_strings:
-        if '.' in num_str:
-            num = float(num_str)
-            numbers.append(int(num * 1000))
+    source overrides request.text; it may be an iterable of text pieces
+    that never split a token (see iter_upload_text).
+    """
+    if source is None:
+        source = request.text
+    
+    if request.feature_type == 'numbers':
+        # Extract and sort numbers
+        if isinstance(source, str):
+            features = extract_numbers_from_text(source)
+        else:
+            features = [num for piece in source for num in extract_numbers_from_text(piece)]
+        feature_count = len(features)
+        if request.sort_by == 'lexicographic':
+            if limit is None:
+                # The dispatcher picks counting, radix or presorted handling
+                sorted_features, sort_strategy = adaptive_sort(features, base=request.base)
+            else:
+                sorted_features = radix_topk(features, limit)
+                sort_strategy = "radix_topk"
+            # Every occurrence is listed; each one carries its number's total
+            counts = Counter(features)
+            feature_counts = [counts[num] for num in sorted_features]
+            # Convert back to strings with proper formatting
+            sorted_features = [format_number(num) for num in sorted_features]
         else:
-            numbers.append(int(num_str))
+            if request.sort_by == 'length':
+                # Length is measured on the formatted numbers
+                features = [format_number(num) for num in features]
+            counts = Counter(features)
+            feature_count = len(counts)
+            ranked = sort_features(counts, request.sort_by, k=limit)
+            sorted_features = [format_number(num) for num, _ in ranked]
+            feature_counts = [count for _, count in ranked]
+            sort_strategy = "multikey_radix"
+    else:
+        # Features are interned once; counting and sorting work on their IDs
+        vocabulary = build_vocabulary(source, 
+                                      feature_type=request.feature_type, 
+                                      n=ngram_size)
+        feature_count = len(vocabulary)
+        
+        # The dispatcher picks the strategy for lexicographic order; the other
+        # orders are integer radix sorts over (key, lexicographic rank)
+        ids, sort_strategy = vocabulary.sorted_ids(request.sort_by, k=limit)
+        
+        # Strings are only materialized for the response
+        sorted_features = vocabulary.materialize(ids)
+        feature_counts = vocabulary.counts_of(ids)
+    
+    return {
+        "sorted_features": sorted_features,
+        "feature_count": feature_count,
+        "feature_counts": feature_counts,
+        "sort_strategy": sort_strategy
+    }
+
+def compute_features(request: ProcessTextRequest, limit: Optional[int] = None, source=None):
+    """Extract, sort and optionally summarize the text of a request.
     
-    return numbers
+    With a limit only the first `limit` sorted features are produced (using
+    the partial radix sort), while feature_count still reports the total.
+    A streamed source (see sort_request_features) is processed as it is
+    read; it is neither cached nor summarized.
+    """
+    if request.sort_by not in SORT_ORDERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sort_by: {request.sort_by}. Use one of: {', '.join(SORT_ORDERS)}"
+        )
+
+    if request.summary_engine is not None and request.summary_engine not in SUMMARY_ENGINES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown summary_engine: {request.summary_engine}. Use one of: {', '.join(SUMMARY_ENGINES)}"
+        )
+
+    if source is None and request.text is None:
+        raise HTTPException(status_code=400, detail="Either text or result_id is required")
+
+    ngram_size = request.ngram_size if request.ngram_range is None else tuple(request.ngram_range)
+    try:
+        ngram_size = ngram_bounds(ngram_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    start_time = time.time()
+    summary = None
+    
+    # Generate summary if requested (cached by summarize_text)
+    if request.summarize:
+        summary = summarize_text(request.text, request.summary_ratio, request.summary_engine)
+    
+    # Export endpoints usually repeat the request /api/process just handled,
+    # so the sorted features are cached by content; base only affects speed
+    if source is not None:
+        result = sort_request_features(request, ngram_size, limit, source)
+    else:
+        cache_key = make_key("features", request.text, request.feature_type,
+                             ngram_size if request.feature_type == 'ngrams' else None,
+                             request.sort_by, limit)
+        result = get_result_cache().get_or_compute(
+            cache_key, lambda: sort_request_features(request, ngram_size, limit)
+        )
+    
+    processing_time = time.time() - start_time
+    
+    return {
+        "sorted_features": result["sorted_features"],
+        "processing_time": processing_time,
+        "feature_count": result["feature_count"],
+        "summary": summary,
+        "feature_counts": result["feature_counts"],
+        "sort_strategy": result["sort_strategy"]
+    }
+
+RESULT_ID_PATTERN = re.compile(r'[0-9a-f]{32}')
+
+def limit_result(result, limit: Optional[int]):
+    """Cut a computed result down to its first `limit` sorted features."""
+    if limit is None or limit >= len(result["sorted_features"]):
+        return result
+    feature_counts = result.get("feature_counts")
+    return {
+        **result,
+        "sorted_features": result["sorted_features"][:limit],
+        "feature_counts": feature_counts[:limit] if feature_counts is not None else None
+    }
+
+def store_result(result, request: Optional[ProcessTextRequest] = None):
+    """Keep a computed result in the result store and return its handle.
+    
+    A preview (fewer sorted features than feature_count) also keeps its
+    request, so exports can still sort the full feature list from the text.
+    Returns None if the result is too large for the store, so no handle is
+    handed out that could never be resolved.
+    """
+    entry = {"result": result, "request": None}
+    if request is not None and len(result["sorted_features"]) < result["feature_count"]:
+        entry["request"] = request.model_dump(exclude={"result_id"})
+    result_id = uuid.uuid4().hex
+    store = get_result_store()
+    if not store.set(result_id, entry):
+        print(f"Result too large for the result store ({store.max_bytes} bytes); no result_id returned")
+        return None
+    return result_id
+
+def load_result(result_id: str, limit: Optional[int] = None):
+    """Get the features of a stored result, sorting the rest of a preview if needed."""
+    # Handles are also file names in the store's disk tier
+    if not RESULT_ID_PATTERN.fullmatch(result_id):
+        raise HTTPException(status_code=400, detail=f"Invalid result_id: {result_id}")
+    
+    store = get_result_store()
+    entry = store.get(result_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired result_id: {result_id}")
+    
+    result = entry["result"]
+    if entry["request"] is not None and (limit is None or limit > len(result["sorted_features"])):
+        # The summary was already made; only the features are missing
+        request = ProcessTextRequest(**{**entry["request"], "summarize": False})
+        result = {**compute_features(request, limit=limit), "summary": result["summary"]}
+        if limit is None:
+            # The full list replaces the text, so this is only done once
+            store.set(result_id, {"result": result, "request": None})
+    return limit_result(result, limit)
+
+async def resolve_features(request: ProcessTextRequest, limit: Optional[int] = None):
+    """Get the features an export request refers to, by result_id or from its text.
+    
+    A handle this process cannot resolve (evicted, expired, or handed out by
+    another worker without a shared NLP_CACHE_DIR) falls back to the text
+    only when the request carries it; otherwise the 404 is passed on so the
+    client processes its input again instead of exporting something else.
+    """
+    if request.result_id is not None:
+        try:
+            return await run_cpu_bound(load_result, request.result_id, limit)
+        except HTTPException as e:
+            if e.status_code != 404 or not request.text:
+                raise
+    return await run_cpu_bound(compute_features, request, limit=limit)
 
 @app.post("/api/process", response_model=ProcessResponse)
 async def process_text(request: ProcessTextRequest):
     """Process text with the specified feature extraction and sorting method.
     Uses optimized radix sort exclusively for all sorting operations.
+    
+    The result is kept in the result store; its result_id can be passed to
+    the export endpoints instead of the text.
     """
     try:
-        start_time = time.time()
-        summary = None
-        
-        # Generate summary if requested
-        if request.summarize:
-            summary = summarize_text(request.text, request.summary_ratio)
-        
-        if request.feature_type == 'numbers':
-            # Extract and sort numbers
-            features = extract_numbers_from_text(request.text)
-            # Using radix_sort_numeric for optimal performance
-            sorted_features = radix_sort_numeric(features, base=request.base)
-            # Convert back to strings with proper formatting
-            sorted_features = [str(num) if num % 1000 == 0 else f"{num/1000:.3f}" 
-                              for num in sorted_features]
-        else:
-            # Process text for other feature types
-            processed_text = preprocess_text(request.text)
-            
-            # Extract features
-            if request.feature_type == 'ngrams':
-                features = extract_features(processed_text, 
-                                           feature_type=request.feature_type, 
-                                           n=request.ngram_size)
-            else:
-                features = extract_features(processed_text, 
-                                           feature_type=request.feature_type)
-            
-            # Using radix_sort_strings for all string sorting
-            sorted_features = radix_sort_strings(features)
-        
-        processing_time = time.time() - start_time
-        
-        return {
-            "sorted_features": sorted_features,
-            "processing_time": processing_time,
-            "feature_count": len(sorted_features),
-            "summary": summary
-        }
+        response = await run_cpu_bound(compute_features, request, limit=request.preview_limit)
+        response["result_id"] = store_result(response, request)
+        return response
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
 
+def read_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES):
+    """Read a whole upload from its spool, enforcing the size limit."""
+    chunks = []
+    size = 0
+    for chunk in iter(lambda: file.file.read(UPLOAD_CHUNK_BYTES), b''):
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Upload exceeds the {max_bytes} byte limit")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+def iter_upload_text(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES):
+    """Stream an upload from its spool as UTF-8 text, in whitespace-aligned pieces.
+    
+    Bytes are decoded incrementally, so characters split across read
+    boundaries decode correctly, and each piece is cut at its last
+    whitespace so no word or number is ever split between two pieces.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    carry = ""
+    size = 0
+    try:
+        for chunk in iter(lambda: file.file.read(UPLOAD_CHUNK_BYTES), b''):
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail=f"Upload exceeds the {max_bytes} byte limit")
+            text = carry + decoder.decode(chunk)
+            cut = max(text.rfind(" "), text.rfind("\n"), text.rfind("\t"), text.rfind("\r"))
+            if cut < 0:
+                carry = text
+                continue
+            carry = text[cut + 1:]
+            yield text[:cut + 1]
+        carry += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"File is not valid UTF-8 text: {e}")
+    if carry:
+        yield carry
+
 @app.post("/api/upload-file")
 async def upload_file(
     file: UploadFile = File(...), 
@@ -139,34 +392,57 @@ async def upload_file(
     ngram_size: int = Form(2),
     base: int = Form(10),
     summarize: bool = Form(False),
-    summary_ratio: float = Form(0.2)
+    summary_ratio: float = Form(0.2),
+    sort_by: str = Form("lexicographic"),
+    preview_limit: Optional[int] = Form(None),
+    ngram_range: Optional[str] = Form(None),
+    summary_engine: Optional[str] = Form(None)
 ):
-    """Process text from an uploaded file."""
+    """Process text from an uploaded file.
+    
+    Plain text and CSV uploads are streamed from the upload spool into the
+    tokenizer unless a summary is requested (which needs the whole text), so
+    memory use does not grow with the file size.
+    """
     try:
-        content = await file.read()
+        if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail=f"Upload exceeds the {MAX_UPLOAD_BYTES} byte limit")
         
         # Extract text based on file type
         file_ext = file.filename.split('.')[-1].lower()
         
-        if file_ext == 'pdf':
-            text = extract_text_from_pdf(content)
-        elif file_ext in ['xlsx', 'xls']:
-            text = extract_text_from_excel(content)
-        else:
-            # Default to UTF-8 text decoding for other file types
-            text = content.decode("utf-8")
-        
-        # Process using the same logic as the text endpoint
         request = ProcessTextRequest(
-            text=text,
+            text="",
             feature_type=feature_type,
             ngram_size=ngram_size,
+            ngram_range=parse_ngram_range(ngram_range),
             base=base,
             summarize=summarize,
-            summary_ratio=summary_ratio
+            summary_ratio=summary_ratio,
+            summary_engine=summary_engine,
+            sort_by=sort_by,
+            preview_limit=preview_limit
         )
+        
+        if file_ext == 'pdf':
+            request.text = await run_cpu_bound(lambda: extract_text_from_pdf(read_upload(file)))
+        elif file_ext in ['xlsx', 'xls']:
+            request.text = await run_cpu_bound(lambda: extract_text_from_excel(read_upload(file)))
+        elif summarize:
+            # Default to UTF-8 text decoding for other file types
+            request.text = await run_cpu_bound(lambda: "".join(iter_upload_text(file)))
+        else:
+            # The upload cannot be read again for an export, so the full
+            # feature list is sorted and stored and only the preview returned
+            response = await run_cpu_bound(compute_features, request, source=iter_upload_text(file))
+            response["result_id"] = store_result(response)
+            return limit_result(response, preview_limit)
+        
+        # Process using the same logic as the text endpoint
         return await process_text(request)
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File processing error: {str(e)}")
 
@@ -175,10 +451,11 @@ async def download_results_as_pdf(request: ProcessTextRequest):
     """Process text and return results as a downloadable PDF."""
     try:
         # Process the text first
-        response = await process_text(request)
+        response = await resolve_features(request, limit=PDF_MAX_FEATURES)
         
         # Generate PDF
-        pdf_content = generate_pdf_report(
+        pdf_content = await run_cpu_bound(
+            generate_pdf_report,
             response["sorted_features"],
             response["processing_time"],
             response["feature_count"],
@@ -194,6 +471,8 @@ async def download_results_as_pdf(request: ProcessTextRequest):
             }
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -209,7 +488,7 @@ async def create_pdf_file(request: ProcessTextRequest):
         print(f"PDF file creation requested with feature type: {request.feature_type}")
         
         # Process the text first
-        response = await process_text(request)
+        response = await resolve_features(request, limit=PDF_MAX_FEATURES)
         
         # Generate a unique filename
         import uuid
@@ -225,7 +504,8 @@ async def create_pdf_file(request: ProcessTextRequest):
         print(f"Generating PDF file at: {filepath}")
         
         # Generate PDF content
-        pdf_content = generate_pdf_report(
+        pdf_content = await run_cpu_bound(
+            generate_pdf_report,
             response["sorted_features"],
             response["processing_time"],
             response["feature_count"],
@@ -245,6 +525,8 @@ async def create_pdf_file(request: ProcessTextRequest):
         print(f"Download URL: {download_url}")
         return {"download_url": download_url, "filename": filename}
     
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -259,7 +541,7 @@ async def create_excel_file(request: ProcessTextRequest):
     """Process text and save an Excel file on the server."""
     try:
         # Process the text first
-        response = await process_text(request)
+        response = await resolve_features(request)
         
         # Generate a unique filename
         import uuid
@@ -274,7 +556,8 @@ async def create_excel_file(request: ProcessTextRequest):
         from file_processor import generate_excel_report
         
         # Generate Excel content
-        excel_content = generate_excel_report(
+        excel_content = await run_cpu_bound(
+            generate_excel_report,
             response["sorted_features"],
             response["processing_time"],
             response["feature_count"],
@@ -289,6 +572,8 @@ async def create_excel_file(request: ProcessTextRequest):
         download_url = f"/static/{filename}"
         return {"download_url": download_url, "filename": filename}
     
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -298,10 +583,43 @@ async def create_excel_file(request: ProcessTextRequest):
             detail=f"Excel generation error: {str(e)}\n\nDetails: {error_details}"
         )
 
+def warm_up():
+    """Load the lazily imported libraries, NLTK data and sort calibration now.
+    
+    Returns a dictionary of what was loaded and how long it took in seconds.
+    """
+    timings = {}
+    timings.update(text_utils.warm_up())
+    timings.update(file_processor.warm_up())
+    start = time.perf_counter()
+    get_calibration()
+    timings["sort_calibration"] = time.perf_counter() - start
+    return timings
+
+@app.on_event("startup")
+def report_cold_start():
+    """Optionally warm up (NLP_WARM_UP=1) and report the cold-start time."""
+    if os.environ.get("NLP_WARM_UP", "0").lower() in ("1", "true", "yes"):
+        timings = warm_up()
+        details = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+        print(f"Warm-up: {details}")
+    print(f"Cold start (pid {os.getpid()}): {time.perf_counter() - _IMPORT_START:.2f}s")
+
+@app.on_event("shutdown")
+def stop_worker_pool():
+    """Stop the sorting worker pool and CPU executor when the server shuts down."""
+    _cpu_executor.shutdown(wait=False)
+    shutdown_worker_pool()
+
 @app.get("/api/health")
 async def health_check():
     """Basic health check endpoint."""
-    return {"status": "ok", "message": "API is healthy"}
+    return {"status": "ok", "message": "API is healthy", **_cpu_load}
+
+@app.get("/api/cache-stats")
+async def cache_stats():
+    """Hit/miss counters of the summary and feature result cache."""
+    return get_result_cache().stats()
 
 @app.get("/test")
 async def simple_test():
@@ -351,7 +669,8 @@ async def simple_pdf_download():
     try:
         # Generate a simple PDF with sample data
         sample_features = ["apple", "banana", "cherry", "date", "elderberry"]
-        pdf_content = generate_pdf_report(
+        pdf_content = await run_cpu_bound(
+            generate_pdf_report,
             sorted_features=sample_features,
             processing_time=0.1234,
             feature_count=len(sample_features),
@@ -366,6 +685,8 @@ async def simple_pdf_download():
                 "Content-Disposition": "attachment; filename=sample_report.pdf"
             }
         )
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -448,10 +769,11 @@ async def direct_pdf_download(request: ProcessTextRequest):
     """Process text and return PDF directly in response."""
     try:
         # Process the text
-        response = await process_text(request)
+        response = await resolve_features(request, limit=PDF_MAX_FEATURES)
         
         # Generate PDF content
-        pdf_content = generate_pdf_report(
+        pdf_content = await run_cpu_bound(
+            generate_pdf_report,
             response["sorted_features"],
             response["processing_time"],
             response["feature_count"],
@@ -471,6 +793,8 @@ async def direct_pdf_download(request: ProcessTextRequest):
                 "Access-Control-Expose-Headers": "Content-Disposition"
             }
         )
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -485,10 +809,11 @@ async def direct_excel_download(request: ProcessTextRequest):
     """Process text and return Excel directly in response."""
     try:
         # Process the text
-        response = await process_text(request)
+        response = await resolve_features(request)
         
         # Generate Excel content
-        excel_content = generate_excel_report(
+        excel_content = await run_cpu_bound(
+            generate_excel_report,
             response["sorted_features"],
             response["processing_time"],
             response["feature_count"],
@@ -508,6 +833,8 @@ async def direct_excel_download(request: ProcessTextRequest):
                 "Access-Control-Expose-Headers": "Content-Disposition"
             }
         )
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -522,10 +849,11 @@ async def simple_download(request: ProcessTextRequest):
     """A very simple file download endpoint for testing."""
     try:
         # Generate a simple text file
+        text = request.text or ""
         content = f"""NLP Processing Results
         
 Time: {time.time()}
-Text: {request.text[:100] + '...' if len(request.text) > 100 else request.text}
+Text: {text[:100] + '...' if len(text) > 100 else text}
 Feature Type: {request.feature_type}
         
 This is a test file to verify downloads are working.
@@ -546,39 +874,31 @@ async def test_endpoint():
     """Simple test endpoint to verify API is accessible."""
     return {"status": "ok", "message": "API is working", "time": time.time()}
 
+def iter_json_content(chunks):
+    """Stream text chunks as the JSON object {"content": "<all chunks>"}."""
+    yield '{"content": "'
+    for chunk in chunks:
+        # Each chunk is escaped on its own; the quotes json.dumps adds are dropped
+        yield json.dumps(chunk)[1:-1]
+    yield '"}'
+
 @app.post("/api/csv")
 async def csv_download(request: ProcessTextRequest):
-    """Generate a simple CSV file for download."""
+    """Stream a simple CSV file of the sorted features for download."""
     try:
         # Process the text
-        response = await process_text(request)
-        
-        # Generate CSV content as byte string (not StringIO)
-        import csv
-        import io
-        
-        # Use BytesIO instead of StringIO to handle binary response
-        buffer = io.StringIO()
-        writer = csv.writer(buffer)
+        response = await resolve_features(request)
         
-        # Write header
-        writer.writerow(["Rank", "Feature"])
-        
-        # Write data
-        for i, feature in enumerate(response["sorted_features"], 1):
-            writer.writerow([i, feature])
-        
-        # Convert to string
-        csv_content = buffer.getvalue()
-        
-        # Return as CSV
-        return Response(
-            content=csv_content,
+        # Rows are written in batches as the client reads them
+        return StreamingResponse(
+            iter_features_csv(response["sorted_features"]),
             media_type="text/csv",
             headers={
                 "Content-Disposition": "attachment; filename=features.csv"
             }
         )
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -590,88 +910,118 @@ async def csv_download(request: ProcessTextRequest):
 
 @app.post("/api/text")
 async def text_download(request: ProcessTextRequest):
-    """Generate a simple text file with the sorted features."""
+    """Stream a simple text file with the sorted features."""
     try:
         # Process the text
-        response = await process_text(request)
+        response = await resolve_features(request)
         
-        # Generate plain text content
-        text_content = "NLP Text Processing Results\n\n"
-        text_content += f"Processing Time: {response['processing_time']:.4f} seconds\n"
-        text_content += f"Features Processed: {response['feature_count']}\n"
-        text_content += f"Sorting Method: Optimized Radix Sort\n\n"
-        
-        if response.get("summary"):
-            text_content += "Text Summary:\n"
-            text_content += response["summary"] + "\n\n"
-        
-        text_content += "Sorted Features:\n"
-        for i, feature in enumerate(response["sorted_features"], 1):
-            text_content += f"{i}. {feature}\n"
-        
-        # Return as plain text
-        return Response(
-            content=text_content,
+        # Return as plain text, written in batches as the client reads it
+        return StreamingResponse(
+            iter_text_report(
+                response["sorted_features"],
+                response["processing_time"],
+                response["feature_count"],
+                response.get("summary")
+            ),
             media_type="text/plain",
             headers={
                 "Content-Disposition": "attachment; filename=features.txt"
             }
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Text generation error: {str(e)}")
 
 @app.post("/api/raw-csv")
 async def raw_csv(request: ProcessTextRequest):
-    """Process text and return raw CSV content."""
+    """Process text and return raw CSV content, streamed as {"content": ...}."""
     try:
         # Process the text
-        response = await process_text(request)
+        response = await resolve_features(request)
         
-        # Generate CSV content
-        import csv
-        import io
-        
-        buffer = io.StringIO()
-        writer = csv.writer(buffer)
-        
-        # Write header
-        writer.writerow(["Rank", "Feature"])
-        
-        # Write data
-        for i, feature in enumerate(response["sorted_features"], 1):
-            writer.writerow([i, feature])
-        
-        # Return raw CSV as text
-        csv_content = buffer.getvalue()
-        
-        return {"content": csv_content}
+        return StreamingResponse(
+            iter_json_content(iter_features_csv(response["sorted_features"])),
+            media_type="application/json"
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"CSV generation error: {str(e)}")
 
 @app.post("/api/raw-text")
 async def raw_text(request: ProcessTextRequest):
-    """Process text and return plain text results."""
+    """Process text and return plain text results, streamed as {"content": ...}."""
     try:
         # Process the text
-        response = await process_text(request)
+        response = await resolve_features(request)
         
-        # Generate text content
-        text_content = "NLP Text Processing Results\n\n"
-        text_content += f"Processing Time: {response['processing_time']:.4f} seconds\n"
-        text_content += f"Features Processed: {response['feature_count']}\n"
-        text_content += f"Sorting Method: Optimized Radix Sort\n\n"
+        text_chunks = iter_text_report(
+            response["sorted_features"],
+            response["processing_time"],
+            response["feature_count"],
+            response.get("summary")
+        )
+        return StreamingResponse(iter_json_content(text_chunks), media_type="application/json")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Text generation error: {str(e)}")
+
+@app.post("/api/ndjson")
+async def ndjson_download(request: ProcessTextRequest):
+    """Stream the sorted features as NDJSON lines with rank, feature and count."""
+    try:
+        response = await resolve_features(request)
         
-        if response.get("summary"):
-            text_content += "Text Summary:\n"
-            text_content += response["summary"] + "\n\n"
+        return StreamingResponse(
+            iter_ndjson_report(response["sorted_features"], response.get("feature_counts")),
+            media_type="application/x-ndjson",
+            headers={
+                "Content-Disposition": "attachment; filename=features.ndjson"
+            }
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"NDJSON generation error: {str(e)}")
+
+async def columnar_download(request: ProcessTextRequest, generate, media_type, filename):
+    """Render the features of a request with a pyarrow-based generator and return the file."""
+    try:
+        response = await resolve_features(request)
         
-        text_content += "Sorted Features:\n"
-        for i, feature in enumerate(response["sorted_features"], 1):
-            text_content += f"{i}. {feature}\n"
+        content = await run_cpu_bound(generate, response["sorted_features"], response.get("feature_counts"))
         
-        return {"content": text_content}
+        return Response(
+            content=content,
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}",
+                "Access-Control-Expose-Headers": "Content-Disposition"
+            }
+        )
+    except HTTPException:
+        raise
+    except ImportError as e:
+        # pyarrow is an optional dependency
+        raise HTTPException(status_code=501, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Text generation error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"{filename} generation error: {str(e)}")
+
+@app.post("/api/parquet")
+async def parquet_download(request: ProcessTextRequest):
+    """Return the sorted features as a Parquet file (needs pyarrow)."""
+    return await columnar_download(
+        request, generate_parquet_report, "application/vnd.apache.parquet", "features.parquet"
+    )
+
+@app.post("/api/arrow")
+async def arrow_download(request: ProcessTextRequest):
+    """Return the sorted features as an Arrow IPC file (needs pyarrow)."""
+    return await columnar_download(
+        request, generate_arrow_report, "application/vnd.apache.arrow.file", "features.arrow"
+    )
 
 @app.get("/api/text-test")
 async def text_test():
@@ -679,4 +1029,6 @@ async def text_test():
     return {"content": "This is a test response from the API server."}
 
 if __name__ == "__main__":
-    uvicorn.run("api:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    # python api.py [--mode dev|prod] [--workers N]; see server.py
+    import server
+    server.main() 
\ No newline at end of file
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Sort benchmark suite for the radix sort module
+
+Times radix_sort_numeric, radix_sort_strings and insertion_sort against the
+builtin sorted() and NumPy sorts over several input distributions and
+sizes, and writes the results as JSON so regressions can be tracked.
+
+It also measures the crossover sizes where radix sort starts to beat
+insertion sort, which is what the small-input cutoffs in radix_sort
+(NUMERIC_INSERTION_CUTOFF and MSD_CUTOFF) should be set to, along with the
+value range up to which counting sort wins and how ordered an input must be
+for timsort to win. With --write-calibration those crossovers are written
+to the calibration file read by sort_dispatcher.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+import radix_sort
+import sort_dispatcher
+from radix_sort import (
+    insertion_sort, radix_sort_numeric, radix_sort_numbers, radix_sort_strings, radix_sort_floats,
+    counting_sort_small_range
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+UNICODE_ALPHABET = "abcdefghijklmnopqrstuvwxyzäöüßéèçñжщыяαβγδ中文字日本語한국어"
+
+def numeric_datasets(size, rng):
+    """
+    Build the numeric inputs for one size.
+
+    Args:
+        size: Number of elements
+        rng: random.Random instance
+
+    Returns:
+        Dict mapping dataset name -> list of numbers
+    """
+    uniform = [rng.randint(-10 ** 9, 10 ** 9) for _ in range(size)]
+    return {
+        "uniform_int": uniform,
+        "zipf_int": [int(rng.paretovariate(1.2)) for _ in range(size)],
+        "sorted_int": sorted(uniform),
+        "reversed_int": sorted(uniform, reverse=True),
+        "small_range_int": [rng.randint(0, 255) for _ in range(size)],
+        "uniform_float": [rng.uniform(-1e6, 1e6) for _ in range(size)],
+    }
+
+def _random_word(rng, length, alphabet):
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+def string_datasets(size, rng):
+    """
+    Build the string inputs for one size.
+
+    Args:
+        size: Number of elements
+        rng: random.Random instance
+
+    Returns:
+        Dict mapping dataset name -> list of strings
+    """
+    ascii_letters = "abcdefghijklmnopqrstuvwxyz"
+    uniform = [_random_word(rng, rng.randint(3, 10), ascii_letters) for _ in range(size)]
+    vocabulary = [_random_word(rng, rng.randint(2, 9), ascii_letters) for _ in range(max(1, size // 10))]
+    return {
+        "uniform_words": uniform,
+        "zipf_words": [vocabulary[min(len(vocabulary), int(rng.paretovariate(1.1))) - 1] for _ in range(size)],
+        "sorted_words": sorted(uniform),
+        # Mostly short strings with a heavy tail of very long "sentences"
+        "long_tail_length": [
+            _random_word(rng, min(5000, int(rng.paretovariate(0.8)) + 1), ascii_letters)
+            for _ in range(size)
+        ],
+        "unicode_words": [_random_word(rng, rng.randint(2, 10), UNICODE_ALPHABET) for _ in range(size)],
+    }
+
+def numeric_algorithms(insertion_max):
+    """Get the (name, function, max_size) triples to run on numeric data."""
+    algorithms = [
+        ("radix_sort_numeric", lambda data: radix_sort_numeric(list(data)) if isinstance(data[0], int)
+            else radix_sort_floats(list(data)), None),
+        ("builtin_sorted", sorted, None),
+        ("insertion_sort", lambda data: insertion_sort(list(data)), insertion_max),
+    ]
+    if np is not None:
+        algorithms.append(("numpy_sort_quick", lambda data: np.sort(np.asarray(data), kind="quicksort"), None))
+        algorithms.append(("numpy_sort_stable", lambda data: np.sort(np.asarray(data), kind="stable"), None))
+    return algorithms
+
+def string_algorithms(insertion_max):
+    """Get the (name, function, max_size) triples to run on string data."""
+    algorithms = [
+        ("radix_sort_strings", radix_sort_strings, None),
+        ("builtin_sorted", sorted, None),
+        ("insertion_sort", lambda data: insertion_sort(list(data)), insertion_max),
+    ]
+    if np is not None:
+        algorithms.append(("numpy_sort_unicode", lambda data: np.sort(np.asarray(data)), None))
+    return algorithms
+
+def time_call(function, data, repeat):
+    """
+    Time a sort function, keeping the best of several runs.
+
+    Args:
+        function: Sort function taking the input list
+        data: Input list (never modified)
+        repeat: Number of runs
+
+    Returns:
+        (best_seconds, result_of_last_run)
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(data)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run_suite(kind, sizes, repeat, insertion_max, rng):
+    """
+    Run every algorithm of one kind over every dataset and size.
+
+    Args:
+        kind: 'numeric' or 'string'
+        sizes: List of input sizes
+        repeat: Runs per measurement
+        insertion_max: Largest input to give the quadratic insertion sort
+        rng: random.Random instance
+
+    Returns:
+        List of result records
+    """
+    make_datasets = numeric_datasets if kind == "numeric" else string_datasets
+    algorithms = numeric_algorithms(insertion_max) if kind == "numeric" else string_algorithms(insertion_max)
+
+    results = []
+    for size in sizes:
+        for dataset, data in make_datasets(size, rng).items():
+            expected = sorted(data)
+            for name, function, max_size in algorithms:
+                if max_size is not None and size > max_size:
+                    continue
+                seconds, result = time_call(function, data, repeat)
+                result = result.tolist() if hasattr(result, "tolist") else result
+                results.append({
+                    "kind": kind,
+                    "dataset": dataset,
+                    "size": size,
+                    "algorithm": name,
+                    "seconds": seconds,
+                    "correct": list(result) == expected,
+                })
+                print(f"{kind:8} {dataset:18} {size:>9} {name:20} {seconds:.6f}s", file=sys.stderr)
+    return results
+
+def find_crossover(radix_fn, data_fn, sizes, repeat, rng):
+    """
+    Find the smallest size at which radix sort beats insertion sort.
+
+    Args:
+        radix_fn: Radix sort to time, with its small-input cutoff disabled
+        data_fn: Function (size, rng) -> input list
+        sizes: Increasing candidate sizes
+        repeat: Runs per measurement
+        rng: random.Random instance
+
+    Returns:
+        Dict with the crossover size (None if insertion sort always won)
+        and the timings measured at each candidate size
+    """
+    timings = []
+    crossover = None
+    for size in sizes:
+        data = data_fn(size, rng)
+        radix_seconds, _ = time_call(radix_fn, data, repeat)
+        insertion_seconds, _ = time_call(lambda d: insertion_sort(list(d)), data, repeat)
+        timings.append({"size": size, "radix": radix_seconds, "insertion": insertion_seconds})
+        if crossover is None and radix_seconds < insertion_seconds:
+            crossover = size
+    return {"crossover": crossover, "timings": timings}
+
+def best_msd_cutoff(candidates, repeat, rng, size=20000):
+    """
+    Find the MSD bucket cutoff that sorts a word list fastest.
+
+    Args:
+        candidates: MSD_CUTOFF values to try
+        repeat: Runs per measurement
+        rng: random.Random instance
+        size: Number of words to sort
+
+    Returns:
+        Dict with the best cutoff and the timing of each candidate
+    """
+    data = [_random_word(rng, rng.randint(3, 10), "abcdefghijklmnopqrstuvwxyz") for _ in range(size)]
+    timings = []
+    for cutoff in candidates:
+        radix_sort.MSD_CUTOFF = cutoff
+        seconds, _ = time_call(radix_sort_strings, data, repeat)
+        timings.append({"cutoff": cutoff, "seconds": seconds})
+    best = min(timings, key=lambda timing: timing["seconds"])["cutoff"]
+    return {"crossover": best, "timings": timings}
+
+def best_counting_range_factor(candidates, repeat, rng, size=20000):
+    """
+    Find the largest value range (as a multiple of the input size) for
+    which counting sort still beats LSD radix sort.
+
+    Args:
+        candidates: Increasing range factors to try
+        repeat: Runs per measurement
+        rng: random.Random instance
+        size: Number of integers to sort
+
+    Returns:
+        Dict with the largest winning factor (0 if radix sort always won,
+        which leaves counting sort unused) and the timings measured for
+        each candidate
+    """
+    timings = []
+    crossover = 0
+    for factor in candidates:
+        data = [rng.randint(0, factor * size) for _ in range(size)]
+        counting_seconds, _ = time_call(counting_sort_small_range, data, repeat)
+        radix_seconds, _ = time_call(lambda d: radix_sort_numbers(list(d)), data, repeat)
+        timings.append({"factor": factor, "counting": counting_seconds, "radix": radix_seconds})
+        if counting_seconds < radix_seconds:
+            crossover = factor
+    return {"crossover": crossover, "timings": timings}
+
+def _nearly_sorted(data, disorder, rng):
+    """Sort data, then move a `disorder` fraction of it to random positions."""
+    result = sorted(data)
+    for _ in range(int(len(result) * disorder)):
+        result.insert(rng.randrange(len(result)), result.pop(rng.randrange(len(result))))
+    return result
+
+def _ascending_ratio(data):
+    """Fraction of adjacent pairs that are in ascending order."""
+    return sum(data[i] <= data[i + 1] for i in range(len(data) - 1)) / (len(data) - 1)
+
+def presorted_crossover(disorders, repeat, rng, size=20000):
+    """
+    Find the least ordered input for which timsort still beats radix sort.
+
+    Inputs are sorted lists with a growing fraction of displaced elements;
+    the crossover is the lowest fraction of ascending adjacent pairs at
+    which sorted() was faster on both numbers and strings.
+
+    Args:
+        disorders: Increasing fractions of elements to displace
+        repeat: Runs per measurement
+        rng: random.Random instance
+        size: Number of elements to sort
+
+    Returns:
+        Dict with the crossover ratio (None if radix sort always won) and
+        the timings measured for each candidate
+    """
+    numbers = [rng.randint(-10 ** 9, 10 ** 9) for _ in range(size)]
+    words = [_random_word(rng, rng.randint(3, 10), "abcdefghijklmnopqrstuvwxyz") for _ in range(size)]
+    radix_fns = (
+        (numbers, lambda d: radix_sort_numbers(list(d))),
+        (words, radix_sort_strings),
+    )
+    timings = []
+    crossover = None
+    for disorder in disorders:
+        ratios = []
+        timsort_won = True
+        for data, radix_fn in radix_fns:
+            data = _nearly_sorted(data, disorder, rng)
+            timsort_seconds, _ = time_call(sorted, data, repeat)
+            radix_seconds, _ = time_call(radix_fn, data, repeat)
+            ratios.append(_ascending_ratio(data))
+            timings.append({"disorder": disorder, "ascending": ratios[-1],
+                            "timsort": timsort_seconds, "radix": radix_seconds})
+            timsort_won = timsort_won and timsort_seconds < radix_seconds
+        if not timsort_won:
+            break
+        crossover = round(max(ratios), 3)
+    return {"crossover": crossover, "timings": timings}
+
+def measure_crossovers(repeat, rng):
+    """
+    Measure the insertion sort cutoffs for numeric and string sorting.
+
+    Args:
+        repeat: Runs per measurement
+        rng: random.Random instance
+
+    Returns:
+        Dict of crossover measurements keyed by the setting they calibrate
+    """
+    saved = radix_sort.NUMERIC_INSERTION_CUTOFF, radix_sort.MSD_CUTOFF
+    try:
+        radix_sort.NUMERIC_INSERTION_CUTOFF = 0
+        numeric = find_crossover(
+            lambda data: radix_sort_numeric(list(data)),
+            lambda size, r: [r.randint(-10 ** 9, 10 ** 9) for _ in range(size)],
+            [8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096],
+            repeat, rng
+        )
+        msd = best_msd_cutoff([8, 16, 32, 64, 128, 256], repeat, rng)
+        radix_sort.MSD_CUTOFF = msd["crossover"]
+        strings = find_crossover(
+            radix_sort_strings,
+            lambda size, r: [_random_word(r, r.randint(3, 10), "abcdefghijklmnopqrstuvwxyz") for _ in range(size)],
+            [32, 64, 128, 256, 512, 1024, 2048],
+            repeat, rng
+        )
+    finally:
+        radix_sort.NUMERIC_INSERTION_CUTOFF, radix_sort.MSD_CUTOFF = saved
+
+    return {
+        "NUMERIC_INSERTION_CUTOFF": numeric,
+        "STRING_INSERTION_CUTOFF": strings,
+        "MSD_CUTOFF": msd,
+        "COUNTING_SORT_RANGE_FACTOR": best_counting_range_factor([1, 2, 4, 8, 16, 32, 64], repeat, rng),
+        "PRESORTED_SAMPLE_RATIO": presorted_crossover([0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5], repeat, rng),
+    }
+
+def write_calibration(crossovers, path):
+    """
+    Update the dispatcher calibration file with measured crossovers.
+
+    Settings whose crossover was not found keep their current value.
+
+    Args:
+        crossovers: Result of measure_crossovers
+        path: Calibration file to write
+    """
+    calibration = sort_dispatcher.load_calibration(path)
+    settings = {
+        "numeric_insertion_cutoff": crossovers["NUMERIC_INSERTION_CUTOFF"]["crossover"],
+        "string_insertion_cutoff": crossovers["STRING_INSERTION_CUTOFF"]["crossover"],
+        "msd_cutoff": crossovers["MSD_CUTOFF"]["crossover"],
+        "counting_sort_range_factor": crossovers["COUNTING_SORT_RANGE_FACTOR"]["crossover"],
+        "presorted_sample_ratio": crossovers["PRESORTED_SAMPLE_RATIO"]["crossover"],
+    }
+    for key, value in settings.items():
+        if value is not None:
+            calibration[key] = value
+    sort_dispatcher.save_calibration(calibration, path)
+    print(f"Calibration written to {path}", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark radix sort against builtin and NumPy sorts')
+    parser.add_argument('--min-size', type=float, default=1e2, help='Smallest input size')
+    parser.add_argument('--max-size', type=float, default=1e5,
+                        help='Largest input size (sizes grow by 10x; up to 1e7)')
+    parser.add_argument('--repeat', '-r', type=int, default=3, help='Runs per measurement (best is kept)')
+    parser.add_argument('--insertion-max', type=int, default=2000,
+                        help='Largest input to time the quadratic insertion sort on')
+    parser.add_argument('--kind', choices=['numeric', 'string', 'all'], default='all',
+                        help='Which sorts to benchmark')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the generated inputs')
+    parser.add_argument('--output', '-o', default='-', help='JSON output path (- for stdout)')
+    parser.add_argument('--write-calibration', nargs='?', const=sort_dispatcher.CALIBRATION_PATH,
+                        help='Write the measured cutoffs to the sort calibration file '
+                             f'(default {sort_dispatcher.CALIBRATION_PATH})')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sizes = []
+    size = int(args.min_size)
+    while size <= int(args.max_size):
+        sizes.append(size)
+        size *= 10
+
+    results = []
+    for kind in (['numeric', 'string'] if args.kind == 'all' else [args.kind]):
+        results.extend(run_suite(kind, sizes, args.repeat, args.insertion_max, rng))
+
+    print("Measuring insertion sort crossovers...", file=sys.stderr)
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__ if np is not None else None,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+        "crossovers": measure_crossovers(args.repeat, rng),
+    }
+
+    if args.write_calibration:
+        write_calibration(report["crossovers"], args.write_calibration)
+
+    failures = [r for r in results if not r["correct"]]
+    output = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output)
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+    if failures:
+        print(f"{len(failures)} benchmark runs produced incorrect output", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
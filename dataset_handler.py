@@ -2,6 +2,8 @@
 Dataset handling utilities for loading and saving text data
 """
 
+import codecs
+
 def load_dataset(file_path):
     """
     Load text data from a dataset file.
@@ -13,6 +15,10 @@ def load_dataset(file_path):
         Text content as a string
     """
     try:
+        if file_path.lower().endswith('.pdf'):
+            from file_processor import extract_text_from_pdf
+            with open(file_path, 'rb') as file:
+                return extract_text_from_pdf(file.read())
         with open(file_path, 'r', encoding='utf-8') as file:
             return file.read()
     except UnicodeDecodeError:
@@ -23,17 +29,65 @@ def load_dataset(file_path):
         print(f"Error loading dataset: {e}")
         return ""
 
-def save_results(results, file_path):
+def detect_encoding(file_path, chunk_size=1024 * 1024):
+    """
+    Detect whether a file is valid UTF-8 without loading it into memory.
+    
+    Args:
+        file_path: Path to the dataset file
+        chunk_size: Number of bytes to validate at a time
+        
+    Returns:
+        'utf-8' if the whole file decodes as UTF-8, otherwise 'latin-1'
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(chunk_size), b''):
+                decoder.decode(chunk)
+            decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return 'latin-1'
+    return 'utf-8'
+
+def iter_dataset_lines(file_path):
+    """
+    Stream a dataset file line by line.
+    
+    Args:
+        file_path: Path to the dataset file
+        
+    Yields:
+        Lines of text, using the same encoding fallback as load_dataset
+        (for PDF files, the text of each page as soon as it is extracted)
+    """
+    if file_path.lower().endswith('.pdf'):
+        from file_processor import iter_pdf_pages
+        with open(file_path, 'rb') as file:
+            content = file.read()
+        for page in iter_pdf_pages(content):
+            yield page + "\n"
+        return
+    
+    with open(file_path, 'r', encoding=detect_encoding(file_path)) as file:
+        yield from file
+
+def save_results(results, file_path, counts=None):
     """
     Save processed results to a file.
     
     Args:
         results: List of processed and sorted features
         file_path: Path to save the results
+        counts: Optional list of occurrence counts, parallel to results
     """
     try:
         with open(file_path, 'w', encoding='utf-8') as file:
-            for i, item in enumerate(results, 1):
-                file.write(f"{i}. {item}\n")
+            if counts is None:
+                for i, item in enumerate(results, 1):
+                    file.write(f"{i}. {item}\n")
+            else:
+                for i, (item, count) in enumerate(zip(results, counts), 1):
+                    file.write(f"{i}. {item} ({count})\n")
     except Exception as e:
         print(f"Error saving results: {e}") 
\ No newline at end of file
@@ -1,36 +1,90 @@
 """
 Download required NLTK data for the ML Data Convertor application.
+
+Resources are stored in a local nltk_data directory next to this script
+(or NLTK_DATA_DIR) so they can be bundled with the application; at runtime
+configure_nltk_data() only looks them up there and never downloads.
 """
-import nltk
+import os
 import sys
 
-def download_nltk_resources():
-    """Download all required NLTK resources."""
-    print("Downloading NLTK resources...")
+NLTK_DATA_DIR = os.environ.get(
+    "NLTK_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data")
+)
+
+# (resource name, path used by nltk.data.find)
+NLTK_RESOURCES = [
+    ("punkt", "tokenizers/punkt"),
+    ("punkt_tab", "tokenizers/punkt_tab"),
+]
+
+_configured = None
+
+def configure_nltk_data():
+    """
+    Point NLTK at the bundled data directory and check what is available.
+
+    The lookup runs once per process. Nothing is downloaded; missing
+    resources are reported so callers can fall back.
+
+    Returns:
+        Set of the available resource names
+    """
+    global _configured
+
+    if _configured is not None:
+        return _configured
+
+    import nltk
+
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+
+    _configured = set()
+    for name, path in NLTK_RESOURCES:
+        try:
+            nltk.data.find(path)
+            _configured.add(name)
+        except LookupError:
+            pass
+
+    missing = [name for name, _ in NLTK_RESOURCES if name not in _configured]
+    if missing:
+        print(f"NLTK resources not found: {', '.join(missing)} "
+              f"(run download_nltk_data.py to bundle them in {NLTK_DATA_DIR})")
+    return _configured
+
+def download_nltk_resources(download_dir=NLTK_DATA_DIR):
+    """Download all required NLTK resources into the bundled data directory."""
+    import nltk
+
+    print(f"Downloading NLTK resources to {download_dir}...")
     try:
         # Download the punkt tokenizer (needed for sentence tokenization)
-        nltk.download('punkt')
+        if not nltk.download('punkt', download_dir=download_dir):
+            raise RuntimeError("punkt could not be downloaded")
         print("✓ Successfully downloaded NLTK punkt tokenizer")
-        
+
         # Specifically download punkt_tab resource
         try:
-            nltk.download('punkt_tab')
+            nltk.download('punkt_tab', download_dir=download_dir)
             print("✓ Successfully downloaded NLTK punkt_tab resource")
         except:
             print("Note: punkt_tab couldn't be downloaded directly, but may be included in punkt")
-        
+
         # Add any other resources you might need here
-        
+
         return True
     except Exception as e:
         print(f"✗ Error downloading NLTK resources: {e}")
         return False
 
 if __name__ == "__main__":
-    success = download_nltk_resources()
+    success = download_nltk_resources(sys.argv[1] if len(sys.argv) > 1 else NLTK_DATA_DIR)
     if success:
         print("All NLTK resources downloaded successfully!")
         sys.exit(0)
     else:
         print("Failed to download all required NLTK resources.")
-        sys.exit(1) 
\ No newline at end of file
+        sys.exit(1)
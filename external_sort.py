@@ -0,0 +1,291 @@
+"""
+External-memory (out-of-core) radix sort for inputs larger than RAM
+
+Features are streamed into on-disk bucket files by their leading key byte
+(MSD radix partitioning). Buckets that fit in the memory budget are loaded
+and sorted with the in-memory radix sorts; larger buckets are partitioned
+again by the next byte. The sorted buckets are streamed out in order, so
+neither the input nor the output ever has to be held in memory at once.
+"""
+
+import itertools
+import os
+import struct
+import sys
+import tempfile
+
+from radix_sort import radix_sort_strings, radix_sort_numbers, float_to_key
+
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+# Rough in-memory cost of one feature beyond its encoded bytes: the Python
+# object header, its list slot and the working copies made while sorting
+ITEM_OVERHEAD = 120
+
+_LENGTH = struct.Struct("<I")
+_RESIDUAL_LENGTH = struct.Struct(">I")
+_ZERO_RESIDUAL = b"\x01"
+_UNITS = {"": 1, "B": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+def parse_memory_limit(value):
+    """
+    Parse a memory size such as '512M', '2G' or '1048576'.
+
+    Args:
+        value: Size string with an optional K/M/G/T suffix
+
+    Returns:
+        Size in bytes
+    """
+    text = str(value).strip().upper()
+    if text.endswith("IB"):
+        text = text[:-2]
+    elif len(text) > 1 and text.endswith("B") and text[-2] in _UNITS:
+        text = text[:-1]
+    unit = text[-1] if text and text[-1] in _UNITS else ""
+    number = text[:-1] if unit else text
+    try:
+        size = int(float(number) * _UNITS[unit])
+    except ValueError:
+        raise ValueError(f"Invalid memory limit: {value}")
+    if size <= 0:
+        raise ValueError(f"Memory limit must be positive: {value}")
+    return size
+
+def _write_record(file, data):
+    """Append one length-prefixed record to a bucket file."""
+    file.write(_LENGTH.pack(len(data)))
+    file.write(data)
+
+def _read_records(path):
+    """Stream the records of a bucket file."""
+    with open(path, "rb") as file:
+        while True:
+            header = file.read(_LENGTH.size)
+            if not header:
+                return
+            yield file.read(_LENGTH.unpack(header)[0])
+
+def _string_key(record):
+    """Sort key of a string record: the UTF-8 bytes themselves."""
+    return record
+
+def _number_key(record):
+    """
+    Exact, order-preserving sort key of a number record.
+
+    The key is the 64-bit float key of the nearest double followed by the
+    signed difference between the number and that double. Ints above 2**53
+    share a double with their neighbours and ints beyond the double range
+    are measured from the largest finite double, so the difference keeps
+    them in exact order. Floats and small ints have a difference of zero.
+
+    Args:
+        record: Encoded number record
+
+    Returns:
+        Key bytes; two keys are equal only if the numbers are equal
+    """
+    num = _decode_number(record)
+    if isinstance(num, float):
+        return float_to_key(num).to_bytes(8, "big") + _ZERO_RESIDUAL
+    try:
+        nearest = float(num)
+    except OverflowError:
+        nearest = sys.float_info.max if num > 0 else -sys.float_info.max
+    return float_to_key(nearest).to_bytes(8, "big") + _encode_residual(num - int(nearest))
+
+def _encode_residual(residual):
+    """
+    Encode a signed int as order-preserving bytes of any length.
+
+    A sign byte is followed by the magnitude's byte length and its bytes;
+    both are inverted for negative numbers so larger magnitudes sort first.
+    """
+    if residual == 0:
+        return _ZERO_RESIDUAL
+    magnitude = abs(residual)
+    data = _RESIDUAL_LENGTH.pack((magnitude.bit_length() + 7) // 8)
+    data += magnitude.to_bytes((magnitude.bit_length() + 7) // 8, "big")
+    if residual > 0:
+        return b"\x02" + data
+    return b"\x00" + bytes(255 - byte for byte in data)
+
+def _decode_number(record):
+    """Parse a number record back into an int or float."""
+    text = record.decode("ascii")
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+def _partition(records, key_fn, depth, directory):
+    """
+    Distribute records into bucket files by the key byte at `depth`.
+
+    Bucket 0 holds records whose key ends before `depth`; bucket b + 1
+    holds keys whose byte at `depth` is b.
+
+    Args:
+        records: Iterable of encoded records
+        key_fn: Function mapping a record to its key bytes
+        depth: The key byte to partition by
+        directory: Directory to create the bucket files in
+
+    Returns:
+        List of (path, record_count, byte_count) per bucket; path is None
+        for empty buckets
+    """
+    files = {}
+    paths = {}
+    sizes = {}
+    try:
+        for record in records:
+            key = key_fn(record)
+            bucket = key[depth] + 1 if depth < len(key) else 0
+            file = files.get(bucket)
+            if file is None:
+                fd, paths[bucket] = tempfile.mkstemp(suffix=f"_{depth}_{bucket}.bin", dir=directory)
+                file = files[bucket] = open(fd, "wb")
+                sizes[bucket] = [0, 0]
+            _write_record(file, record)
+            sizes[bucket][0] += 1
+            sizes[bucket][1] += len(record)
+    finally:
+        for file in files.values():
+            file.close()
+
+    return [
+        (paths[bucket], sizes[bucket][0], sizes[bucket][1]) if bucket in paths
+        else (None, 0, 0)
+        for bucket in range(257)
+    ]
+
+def _sort_buckets(records, key_fn, sort_fn, depth, memory_limit, unique, directory):
+    """
+    Recursively partition records and yield them in sorted order.
+
+    Args:
+        records: Iterable of encoded records
+        key_fn: Function mapping a record to its key bytes
+        sort_fn: In-memory sort for a list of records
+        depth: The key byte to partition by
+        memory_limit: Memory budget in bytes for one in-memory bucket
+        unique: Whether to drop duplicate records
+        directory: Directory for temporary bucket files
+
+    Yields:
+        Records in sorted order
+    """
+    buckets = _partition(records, key_fn, depth, directory)
+
+    for bucket, (path, count, size) in enumerate(buckets):
+        if path is None:
+            continue
+
+        if size + count * ITEM_OVERHEAD <= memory_limit:
+            loaded = list(_read_records(path))
+            if unique:
+                loaded = list(set(loaded))
+            yield from sort_fn(loaded)
+        elif bucket == 0:
+            # Every key in this bucket ended at `depth`, so they are all equal
+            records_in_bucket = _read_records(path)
+            if unique:
+                yield next(records_in_bucket)
+            else:
+                yield from records_in_bucket
+        else:
+            yield from _sort_buckets(
+                _read_records(path), key_fn, sort_fn, depth + 1,
+                memory_limit, unique, directory
+            )
+
+        os.remove(path)
+
+def _external_sort(records, key_fn, sort_fn, memory_limit, unique, tmp_dir):
+    """
+    Sort records in memory if they fit the budget, spilling to disk if not.
+
+    Args:
+        records: Iterable of encoded records
+        key_fn: Function mapping a record to its key bytes
+        sort_fn: In-memory sort for a list of records
+        memory_limit: Memory budget in bytes
+        unique: Whether to drop duplicate records
+        tmp_dir: Directory for temporary bucket files (system default if None)
+
+    Yields:
+        Records in sorted order
+    """
+    records = iter(records)
+    buffered = []
+    used = 0
+    for record in records:
+        buffered.append(record)
+        used += len(record) + ITEM_OVERHEAD
+        if used > memory_limit:
+            break
+    else:
+        if unique:
+            buffered = list(set(buffered))
+        yield from sort_fn(buffered)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="radix_sort_", dir=tmp_dir) as directory:
+        yield from _sort_buckets(itertools.chain(buffered, records), key_fn, sort_fn, 0,
+                                 memory_limit, unique, directory)
+
+def _sort_string_records(records):
+    """Sort UTF-8 string records in memory."""
+    strings = [record.decode("utf-8", "surrogatepass") for record in records]
+    return [s.encode("utf-8", "surrogatepass") for s in radix_sort_strings(strings)]
+
+def _sort_number_records(records):
+    """Sort number records in memory."""
+    numbers = radix_sort_numbers([_decode_number(record) for record in records])
+    return [_encode_number(num) for num in numbers]
+
+def _encode_number(num):
+    """Encode a number as a record that round-trips exactly."""
+    return (repr(num) if isinstance(num, float) else str(num)).encode("ascii")
+
+def external_sort_strings(features, memory_limit=DEFAULT_MEMORY_LIMIT, unique=True, tmp_dir=None):
+    """
+    Sort a stream of strings under a memory budget.
+
+    Args:
+        features: Iterable of strings (may be a generator)
+        memory_limit: Memory budget in bytes for one in-memory bucket
+        unique: Whether to drop duplicate strings
+        tmp_dir: Directory for temporary bucket files (system default if None)
+
+    Yields:
+        Strings in sorted order
+    """
+    records = (feature.encode("utf-8", "surrogatepass") for feature in features)
+    for record in _external_sort(records, _string_key, _sort_string_records,
+                                 memory_limit, unique, tmp_dir):
+        yield record.decode("utf-8", "surrogatepass")
+
+def external_sort_numbers(numbers, memory_limit=DEFAULT_MEMORY_LIMIT, unique=False, tmp_dir=None):
+    """
+    Sort a stream of ints and/or floats under a memory budget.
+
+    Numbers are partitioned by the bytes of their order-preserving 64-bit
+    key (see radix_sort.float_to_key), most significant byte first, then by
+    an exact tiebreak for ints that do not fit a double.
+
+    Args:
+        numbers: Iterable of numbers (may be a generator)
+        memory_limit: Memory budget in bytes for one in-memory bucket
+        unique: Whether to drop duplicate numbers
+        tmp_dir: Directory for temporary bucket files (system default if None)
+
+    Yields:
+        Numbers in sorted order
+    """
+    records = (_encode_number(num) for num in numbers)
+    for record in _external_sort(records, _number_key, _sort_number_records,
+                                 memory_limit, unique, tmp_dir):
+        yield _decode_number(record)
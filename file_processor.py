@@ -3,12 +3,102 @@ File processor module for handling different file types.
 """
 
 import io
-import pandas as pd
-import PyPDF2
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
+
+# pandas, PyPDF2, reportlab and pyarrow are imported inside the functions
+# that use them so that importing this module (and starting the API) stays
+# fast; pyarrow is optional and only needed for the Parquet/Arrow exports
+
+# Only the first features are rendered to keep PDFs small; callers can
+# produce just this many with radix_sort.radix_topk
+PDF_MAX_FEATURES = 1000
+
+# PDFs with fewer pages are extracted in the calling process
+PDF_PARALLEL_MIN_PAGES = 16
+
+# .xlsx workbooks are streamed with openpyxl in chunks of this many rows
+EXCEL_CHUNK_ROWS = 10000
+
+# Streamed CSV, text and NDJSON reports are written this many feature rows at a time
+EXPORT_BATCH_ROWS = 10000
+
+def _extract_pages_task(task):
+    """
+    Worker: extract the text of a range of pages from a PDF in shared memory.
+    
+    Args:
+        task: (shm_name, size, start_page, end_page) tuple
+        
+    Returns:
+        List of page texts
+    """
+    from multiprocessing import shared_memory
+    import PyPDF2
+    
+    shm_name, size, start, end = task
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        reader = PyPDF2.PdfReader(io.BytesIO(bytes(shm.buf[:size])))
+        return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+    finally:
+        shm.close()
+
+def _iter_pages_parallel(file_content, page_count, pool):
+    """Fan page ranges out to the pool, yielding pages in document order."""
+    from multiprocessing import shared_memory
+    from worker_pool import get_worker_count
+    
+    shm = shared_memory.SharedMemory(create=True, size=len(file_content))
+    pending = []
+    try:
+        shm.buf[:len(file_content)] = file_content
+        # A few ranges per worker keeps them all busy when pages vary in cost
+        pages_per_task = max(1, page_count // (get_worker_count() * 4))
+        pending = [
+            pool.apply_async(_extract_pages_task,
+                             ((shm.name, len(file_content), start, min(start + pages_per_task, page_count)),))
+            for start in range(0, page_count, pages_per_task)
+        ]
+        # Each range is handed back as soon as it (and those before it) are done
+        for result in pending:
+            yield from result.get()
+    finally:
+        # If the consumer stopped early, ranges may still be queued or running;
+        # they must attach to the shared memory before its name is unlinked
+        for result in pending:
+            result.wait()
+        shm.close()
+        shm.unlink()
+
+def iter_pdf_pages(file_content):
+    """
+    Stream the text of each page of a PDF, in page order.
+    
+    Large PDFs are split into page ranges that the worker pool extracts in
+    parallel, each worker reading the PDF bytes from shared memory. Pages are
+    yielded as soon as they are ready, so a consumer such as the streaming
+    tokenizer can start before the last page has been parsed.
+    
+    Args:
+        file_content: Binary content of the PDF file
+        
+    Yields:
+        Text of each page
+    """
+    import PyPDF2
+    from worker_pool import get_worker_pool
+    
+    try:
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+        page_count = len(pdf_reader.pages)
+        
+        pool = get_worker_pool() if page_count >= PDF_PARALLEL_MIN_PAGES else None
+        if pool is None:
+            for page in pdf_reader.pages:
+                yield page.extract_text() or ""
+        else:
+            yield from _iter_pages_parallel(file_content, page_count, pool)
+    except Exception as e:
+        raise Exception(f"Error extracting text from PDF: {str(e)}")
 
 def extract_text_from_pdf(file_content):
     """
@@ -20,35 +110,123 @@ def extract_text_from_pdf(file_content):
     Returns:
         Extracted text as a string
     """
+    # One join at the end instead of growing a string page by page
+    return "".join(page + "\n" for page in iter_pdf_pages(file_content))
+
+def _format_value(value):
+    """
+    Render one spreadsheet cell as text.
+    
+    Excel stores every number as a double, so integral numbers are shown
+    without a fractional part whether the reader returns them as int or
+    float; datetimes keep their time of day.
+    """
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e16:
+        return str(int(value))
+    return str(value)
+
+def _column_to_text(values):
+    """Vectorized _format_value over a DataFrame column (nulls are not masked)."""
+    import pandas as pd
+    
+    kind = values.dtype.kind
+    if kind == "f":
+        integral = (values % 1 == 0) & (values.abs() < 1e16)
+        as_int = values.where(integral, 0).astype("int64").astype(str)
+        return as_int.where(integral, values.astype(str))
+    if kind == "M":
+        cells = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+        fraction = values.dt.microsecond != 0
+        return cells.where(~fraction, values.dt.strftime("%Y-%m-%d %H:%M:%S.%f"))
+    if kind == "O" and pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty"):
+        # Mixed columns hold Python numbers and datetimes; format them one by one
+        return values.map(_format_value, na_action="ignore")
+    return values.astype(str)
+
+def _frame_to_text(df):
+    """
+    Render a DataFrame as text: each row's non-null cells followed by a
+    space, one row per line.
+    
+    Cells are converted column by column (see _column_to_text, which
+    formats them like _format_value) and rows are concatenated with one
+    vectorized add per column, so no Python code runs per cell except in
+    columns of mixed types.
+    """
+    import pandas as pd
+    
+    if df.empty:
+        return ""
+    
+    rows = pd.Series("", index=df.index, dtype=object)
+    for column in df.columns:
+        values = df[column]
+        cells = (_column_to_text(values) + " ").astype(object)
+        rows = rows + cells.where(values.notna(), "")
+    return "\n".join(rows.tolist()) + "\n"
+
+def _format_cells(row):
+    """Render one worksheet row the same way _frame_to_text does."""
+    return "".join(_format_value(value) + " " for value in row if value is not None) + "\n"
+
+def iter_excel_text(file_content, chunk_rows=EXCEL_CHUNK_ROWS):
+    """
+    Stream the text of every sheet of an .xlsx workbook in chunks of rows.
+    
+    The workbook is opened with openpyxl in read-only mode, so rows are read
+    from the file as they are needed instead of loading whole sheets. As with
+    pandas.read_excel, the first row of each sheet is treated as the header
+    and left out.
+    
+    Args:
+        file_content: Binary content of the .xlsx file
+        chunk_rows: Number of rows per yielded chunk
+        
+    Yields:
+        Text of up to chunk_rows rows
+    """
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(io.BytesIO(file_content), read_only=True, data_only=True)
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
-    except Exception as e:
-        raise Exception(f"Error extracting text from PDF: {str(e)}")
+        for sheet in workbook.worksheets:
+            lines = []
+            for row in sheet.iter_rows(min_row=2, values_only=True):
+                lines.append(_format_cells(row))
+                if len(lines) >= chunk_rows:
+                    yield "".join(lines)
+                    lines = []
+            if lines:
+                yield "".join(lines)
+    finally:
+        workbook.close()
 
-def extract_text_from_excel(file_content):
+def extract_text_from_excel(file_content, stream=None):
     """
-    Extract text from an Excel file.
+    Extract text from every sheet of an Excel file.
+    
+    .xlsx workbooks are always streamed with openpyxl (which is also what
+    pandas would read them with), so the text never depends on the file
+    size; legacy .xls files are loaded with pandas and formatted the same
+    way.
     
     Args:
         file_content: Binary content of the Excel file
+        stream: Set to False to load .xlsx sheets into DataFrames instead
         
     Returns:
         Extracted text as a string
     """
+    import pandas as pd
+    
+    # .xlsx files are zip archives; legacy .xls files can't be streamed
+    is_xlsx = file_content[:2] == b"PK"
     try:
-        df = pd.read_excel(io.BytesIO(file_content))
-        # Convert DataFrame to string, handling different data types
-        text = ""
-        for _, row in df.iterrows():
-            for item in row:
-                if pd.notna(item):  # Skip NaN values
-                    text += str(item) + " "
-            text += "\n"
-        return text
+        if stream is not False and is_xlsx:
+            return "".join(iter_excel_text(file_content))
+        
+        sheets = pd.read_excel(io.BytesIO(file_content), sheet_name=None)
+        return "".join(_frame_to_text(df) for df in sheets.values())
     except Exception as e:
         raise Exception(f"Error extracting text from Excel: {str(e)}")
 
@@ -56,6 +234,11 @@ def generate_pdf_report(sorted_features, processing_time, feature_count, summary
     """
     Generate a PDF report with the processing results.
     """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+    
     try:
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
@@ -89,8 +272,8 @@ def generate_pdf_report(sorted_features, processing_time, feature_count, summary
         
         # Create table data
         data = [["#", "Feature"]]
-        # Limit to 1000 items to avoid huge PDFs
-        max_features = min(1000, len(sorted_features))
+        # Limit to PDF_MAX_FEATURES items to avoid huge PDFs
+        max_features = min(PDF_MAX_FEATURES, len(sorted_features))
         
         for i, feature in enumerate(sorted_features[:max_features], 1):
             # Ensure the feature is a string and not too long
@@ -150,10 +333,9 @@ def generate_excel_report(sorted_features, processing_time, feature_count, summa
     Returns:
         Excel file content as bytes
     """
+    import pandas as pd
+    
     try:
-        import pandas as pd
-        import io
-        
         # Create a buffer
         buffer = io.BytesIO()
         
@@ -167,8 +349,7 @@ def generate_excel_report(sorted_features, processing_time, feature_count, summa
         # Write the DataFrame to the Excel file
         df.to_excel(writer, sheet_name='Sorted Features', index=False)
         
-        # Get a reference to the workbook and worksheet
-        workbook = writer.book
+        # Get a reference to the worksheet
         worksheet = writer.sheets['Sorted Features']
         
         # Add a summary sheet if available
@@ -214,44 +395,245 @@ def generate_excel_report(sorted_features, processing_time, feature_count, summa
         buffer.seek(0)
         return buffer.getvalue()
 
-def generate_csv_report(sorted_features, processing_time, feature_count, summary=None):
+def _iter_csv_batches(rows, batch_rows=EXPORT_BATCH_ROWS):
     """
-    Generate a CSV report with the processing results.
+    Write rows as CSV, yielding the text of every batch of rows.
     
     Args:
-        sorted_features: List of sorted features
-        processing_time: Time taken to process the text
-        feature_count: Number of features processed
-        summary: Optional summary of the text
+        rows: Iterable of row lists (may be a generator)
+        batch_rows: Rows written per yielded chunk
         
-    Returns:
-        CSV file content as string
+    Yields:
+        CSV text chunks
     """
     import csv
-    import io
+    from itertools import islice
     
-    # Create a buffer
     buffer = io.StringIO()
     writer = csv.writer(buffer)
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_rows))
+        if not batch:
+            break
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+def _numbered(sorted_features):
+    """Rows of (1-based rank, feature)."""
+    return zip(range(1, len(sorted_features) + 1), sorted_features)
+
+def iter_features_csv(sorted_features, batch_rows=EXPORT_BATCH_ROWS):
+    """
+    Stream the sorted features as a two-column CSV (Rank, Feature).
+    
+    Args:
+        sorted_features: List of sorted features
+        batch_rows: Rows written per yielded chunk
+        
+    Yields:
+        CSV text chunks
+    """
+    yield "Rank,Feature\r\n"
+    yield from _iter_csv_batches(_numbered(sorted_features), batch_rows)
+
+def iter_csv_report(sorted_features, processing_time, feature_count, summary=None,
+                    batch_rows=EXPORT_BATCH_ROWS):
+    """
+    Stream a CSV report with the processing results.
     
+    Args:
+        sorted_features: List of sorted features
+        processing_time: Time taken to process the text
+        feature_count: Number of features processed
+        summary: Optional summary of the text
+        batch_rows: Feature rows written per yielded chunk
+        
+    Yields:
+        CSV text chunks; the metadata comes first, in its own chunk
+    """
     # Write metadata
-    writer.writerow(["NLP Processing Results"])
-    writer.writerow(["Processing Time (seconds)", f"{processing_time:.4f}"])
-    writer.writerow(["Features Processed", feature_count])
-    writer.writerow(["Sorting Method", "Optimized Radix Sort"])
+    header = [
+        ["NLP Processing Results"],
+        ["Processing Time (seconds)", f"{processing_time:.4f}"],
+        ["Features Processed", feature_count],
+        ["Sorting Method", "Optimized Radix Sort"],
+    ]
     
     # Add summary if available
     if summary:
-        writer.writerow([])
-        writer.writerow(["Text Summary"])
-        writer.writerow([summary])
+        header += [[], ["Text Summary"], [summary]]
     
     # Write header for features
-    writer.writerow([])
-    writer.writerow(["#", "Feature"])
+    header += [[], ["#", "Feature"]]
+    yield from _iter_csv_batches(header)
     
     # Write sorted features
-    for i, feature in enumerate(sorted_features, 1):
-        writer.writerow([i, feature])
+    yield from _iter_csv_batches(_numbered(sorted_features), batch_rows)
+
+def generate_csv_report(sorted_features, processing_time, feature_count, summary=None):
+    """
+    Generate a CSV report with the processing results.
+    
+    Args:
+        sorted_features: List of sorted features
+        processing_time: Time taken to process the text
+        feature_count: Number of features processed
+        summary: Optional summary of the text
+        
+    Returns:
+        CSV file content as string
+    """
+    return "".join(iter_csv_report(sorted_features, processing_time, feature_count, summary))
+
+def iter_text_report(sorted_features, processing_time, feature_count, summary=None,
+                     batch_rows=EXPORT_BATCH_ROWS):
+    """
+    Stream a plain text report with the processing results.
+    
+    Args:
+        sorted_features: List of sorted features
+        processing_time: Time taken to process the text
+        feature_count: Number of features processed
+        summary: Optional summary of the text
+        batch_rows: Feature lines per yielded chunk
+        
+    Yields:
+        Text chunks; the metadata comes first, in its own chunk
+    """
+    header = [
+        "NLP Text Processing Results\n\n",
+        f"Processing Time: {processing_time:.4f} seconds\n",
+        f"Features Processed: {feature_count}\n",
+        "Sorting Method: Optimized Radix Sort\n\n",
+    ]
+    
+    if summary:
+        header += ["Text Summary:\n", summary, "\n\n"]
+    
+    header.append("Sorted Features:\n")
+    yield "".join(header)
+    
+    for start in range(0, len(sorted_features), batch_rows):
+        batch = sorted_features[start:start + batch_rows]
+        yield "".join(f"{rank}. {feature}\n" for rank, feature in enumerate(batch, start + 1))
+
+def iter_ndjson_report(sorted_features, feature_counts=None, batch_rows=EXPORT_BATCH_ROWS):
+    """
+    Stream the sorted features as newline-delimited JSON.
+    
+    Every line is {"rank": ..., "feature": ..., "count": ...}; count is
+    null if no counts are given.
+    
+    Args:
+        sorted_features: List of sorted features
+        feature_counts: Optional list of occurrence counts, parallel to sorted_features
+        batch_rows: Lines per yielded chunk
+        
+    Yields:
+        NDJSON text chunks
+    """
+    # The C string escaper of the json module, without the encoder overhead
+    from json.encoder import encode_basestring
+    
+    for start in range(0, len(sorted_features), batch_rows):
+        batch = sorted_features[start:start + batch_rows]
+        counts = feature_counts[start:start + batch_rows] if feature_counts is not None else ["null"] * len(batch)
+        yield "".join(
+            f'{{"rank": {rank}, "feature": {feature}, "count": {count}}}\n'
+            for rank, feature, count in zip(range(start + 1, start + len(batch) + 1),
+                                            map(encode_basestring, batch), counts)
+        )
+
+def feature_table(sorted_features, feature_counts=None):
+    """
+    Build an Arrow table of the sorted features.
+    
+    Args:
+        sorted_features: List of sorted features
+        feature_counts: Optional list of occurrence counts, parallel to sorted_features
+        
+    Returns:
+        pyarrow.Table with int64 rank, string feature and int64 count
+        columns (count is null when no counts are given)
+        
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("Parquet and Arrow exports need pyarrow (pip install pyarrow)")
+    import numpy as np
+    
+    size = len(sorted_features)
+    if feature_counts is not None:
+        counts = pa.array(feature_counts, type=pa.int64())
+    else:
+        counts = pa.nulls(size, type=pa.int64())
+    
+    return pa.table({
+        "rank": pa.array(np.arange(1, size + 1, dtype=np.int64)),
+        "feature": pa.array(sorted_features, type=pa.string()),
+        "count": counts,
+    })
+
+def generate_parquet_report(sorted_features, feature_counts=None):
+    """
+    Generate a Parquet file of the sorted features.
+    
+    Args:
+        sorted_features: List of sorted features
+        feature_counts: Optional list of occurrence counts, parallel to sorted_features
+        
+    Returns:
+        Parquet file content as bytes
+    """
+    table = feature_table(sorted_features, feature_counts)
+    import pyarrow.parquet as pq
+    
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression="zstd")
+    return buffer.getvalue()
+
+def generate_arrow_report(sorted_features, feature_counts=None):
+    """
+    Generate an Arrow IPC file of the sorted features.
+    
+    Args:
+        sorted_features: List of sorted features
+        feature_counts: Optional list of occurrence counts, parallel to sorted_features
+        
+    Returns:
+        Arrow IPC file (Feather v2) content as bytes
+    """
+    table = feature_table(sorted_features, feature_counts)
+    import pyarrow as pa
+    
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=EXPORT_BATCH_ROWS * 10)
+    return sink.getvalue().to_pybytes()
+
+def warm_up():
+    """
+    Import the PDF, Excel and report libraries ahead of the first request.
+    
+    Returns:
+        Dictionary mapping library name -> import time in seconds
+    """
+    import importlib
+    import time
     
-    return buffer.getvalue() 
\ No newline at end of file
+    timings = {}
+    for module in ("pandas", "PyPDF2", "reportlab.platypus", "xlsxwriter"):
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            print(f"Warm-up could not import {module}: {e}")
+            continue
+        timings[module] = time.perf_counter() - start
+    return timings
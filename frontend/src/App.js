@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { 
   Container, 
@@ -23,6 +23,8 @@ import {
 import './App.css';
 
 const API_URL = 'http://localhost:8000';
+// Only the first features are sorted and shown; exports contain all of them
+const PREVIEW_LIMIT = 1000;
 
 function App() {
   const [text, setText] = useState('');
@@ -39,6 +41,12 @@ function App() {
   const [contentType, setContentType] = useState('');
   const [successCopy, setSuccessCopy] = useState(false);
 
+  // The result handle only describes the text and options it was made from;
+  // once they change, exports send the current text instead
+  useEffect(() => {
+    setResults((current) => (current?.result_id ? { ...current, result_id: null } : current));
+  }, [text, featureType, ngramSize, base, summarize, summaryRatio]);
+
   const handleTextSubmit = async () => {
     if (!text.trim()) {
       setError('Please enter some text to process');
@@ -55,7 +63,8 @@ function App() {
         ngram_size: ngramSize,
         base,
         summarize,
-        summary_ratio: summaryRatio
+        summary_ratio: summaryRatio,
+        preview_limit: PREVIEW_LIMIT
       });
       
       setResults(response.data);
@@ -82,6 +91,7 @@ function App() {
     formData.append('base', base);
     formData.append('summarize', summarize);
     formData.append('summary_ratio', summaryRatio);
+    formData.append('preview_limit', PREVIEW_LIMIT);
     
     try {
       const response = await axios.post(`${API_URL}/api/upload-file`, formData, {
@@ -103,7 +113,7 @@ function App() {
   };
 
   const handleViewText = async () => {
-    if (!text.trim() && !results) {
+    if (!text.trim() && !results?.result_id) {
       setError('Please process some text first');
       return;
     }
@@ -116,7 +126,9 @@ function App() {
     
     try {
       const response = await axios.post(url, {
-        text: text || "Sample text",
+        result_id: results?.result_id,
+        // Only real text: the server falls back to it if the handle expired
+        text: text.trim() ? text : undefined,
         feature_type: featureType,
         ngram_size: ngramSize,
         base,
@@ -129,14 +141,20 @@ function App() {
       setContentType('text');
     } catch (err) {
       console.error('Error getting text content:', err);
-      setError(`Error retrieving text content: ${err.message}`);
+      if (err.response?.status === 404) {
+        // The stored result expired and there was no text to fall back to
+        setResults(null);
+        setError('The processed result has expired; please process the text or file again');
+      } else {
+        setError(`Error retrieving text content: ${err.message}`);
+      }
     } finally {
       setLoading(false);
     }
   };
 
   const handleViewCSV = async () => {
-    if (!text.trim() && !results) {
+    if (!text.trim() && !results?.result_id) {
       setError('Please process some text before viewing CSV');
       return;
     }
@@ -149,7 +167,9 @@ function App() {
       console.log('Attempting to fetch CSV from URL:', url);
       
       const response = await axios.post(url, {
-        text: text || "Sample text",
+        result_id: results?.result_id,
+        // Only real text: the server falls back to it if the handle expired
+        text: text.trim() ? text : undefined,
         feature_type: featureType,
         ngram_size: ngramSize,
         base,
@@ -162,7 +182,13 @@ function App() {
       setContentType('csv');
     } catch (err) {
       console.error('Error getting CSV content:', err);
-      setError(`Error retrieving CSV content: ${err.message}`);
+      if (err.response?.status === 404) {
+        // The stored result expired and there was no text to fall back to
+        setResults(null);
+        setError('The processed result has expired; please process the text or file again');
+      } else {
+        setError(`Error retrieving CSV content: ${err.message}`);
+      }
     } finally {
       setLoading(false);
     }
@@ -414,6 +440,11 @@ function App() {
             <Typography variant="h6" gutterBottom>
               Sorted Features:
             </Typography>
+            {results.feature_count > results.sorted_features.length && (
+              <Typography variant="body2" color="text.secondary" gutterBottom>
+                Showing the first {results.sorted_features.length} of {results.feature_count} features.
+              </Typography>
+            )}
             <Paper 
               variant="outlined" 
               sx={{ 
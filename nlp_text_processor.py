@@ -6,36 +6,56 @@ This program processes text data from a dataset file and uses radix sort for eff
 
 import argparse
 import time
-import re
-from text_utils import preprocess_text, extract_features
-from radix_sort import radix_sort_strings, radix_sort_numeric
-from dataset_handler import load_dataset, save_results
+from collections import Counter
+from text_utils import build_vocabulary, iter_features, ngram_bounds, extract_numbers_from_text, format_number
+from radix_sort import sort_features, SORT_ORDERS
+from sort_dispatcher import adaptive_sort
+from external_sort import external_sort_strings, external_sort_numbers, parse_memory_limit
+from dataset_handler import load_dataset, save_results, iter_dataset_lines
 
-def extract_numbers_from_text(text):
+def iter_line_features(lines, feature_type, n=2):
     """
-    Extract all numbers from text.
+    Extract features from a stream of lines without loading the whole text.
+    
+    N-grams and sentences are carried across line boundaries. Sentences are
+    split on their terminators before punctuation is stripped.
     
     Args:
-        text: Input text
+        lines: Iterable of text lines
+        feature_type: 'words', 'sentences', 'ngrams' or 'numbers'
+        n: Size of n-grams if feature_type is 'ngrams'
         
-    Returns:
-        List of numbers found in the text
+    Yields:
+        Features in document order (numbers as ints or floats)
+    """
+    if feature_type == 'numbers':
+        for line in lines:
+            yield from extract_numbers_from_text(line)
+    else:
+        yield from iter_features(lines, feature_type, n, unique=False)
+
+def run_external_sort(args, memory_limit):
     """
-    # Find all numbers in the text
-    number_strings = re.findall(r'-?\d+(?:\.\d+)?', text)
+    Stream the input through the external-memory radix sort into the output.
     
-    # Convert to integers or floats
-    numbers = []
-    for num_str in number_strings:
-        if '.' in num_str:
-            # Handle floating point numbers by scaling
-            num = float(num_str)
-            # Scale to integer for radix sort
-            numbers.append(int(num * 1000))
-        else:
-            numbers.append(int(num_str))
+    Args:
+        args: Parsed command line arguments
+        memory_limit: Memory budget in bytes
+    """
+    print(f"Streaming {args.input} with a memory limit of {memory_limit} bytes...")
+    features = iter_line_features(iter_dataset_lines(args.input), args.feature, args.ngram_size)
+    
+    start_time = time.time()
+    if args.feature == 'numbers':
+        sorted_features = (format_number(num) for num in external_sort_numbers(features, memory_limit))
+    else:
+        sorted_features = external_sort_strings(features, memory_limit)
+    
+    print(f"Saving results to {args.output}...")
+    save_results(sorted_features, args.output)
     
-    return numbers
+    print(f"Sorting completed in {time.time() - start_time:.4f} seconds")
+    print("Processing complete!")
 
 def main():
     # Parse command line arguments
@@ -46,50 +66,83 @@ def main():
                         choices=['words', 'sentences', 'ngrams', 'numbers'],
                         help='Text feature to extract and sort')
     parser.add_argument('--ngram-size', '-n', type=int, default=2, help='Size of n-grams if feature is ngrams')
+    parser.add_argument('--ngram-range', type=int, nargs=2, metavar=('MIN', 'MAX'),
+                        help='Extract every n-gram size from MIN to MAX in one pass (overrides --ngram-size)')
     parser.add_argument('--base', '-b', type=int, default=10, help='Base to use for radix sort (for numbers)')
+    parser.add_argument('--sort-by', '-s', default='lexicographic', choices=SORT_ORDERS,
+                        help='Order of the output (frequency ranks by count, then feature)')
+    parser.add_argument('--memory-limit', '-m',
+                        help='Sort out of core within this much memory, e.g. 512M or 2G')
     args = parser.parse_args()
     
+    if args.ngram_range:
+        try:
+            args.ngram_size = ngram_bounds(tuple(args.ngram_range))
+        except ValueError as e:
+            parser.error(str(e))
+    
+    if args.memory_limit:
+        if args.sort_by != 'lexicographic':
+            parser.error('--memory-limit only supports --sort-by lexicographic')
+        try:
+            memory_limit = parse_memory_limit(args.memory_limit)
+        except ValueError as e:
+            parser.error(str(e))
+        run_external_sort(args, memory_limit)
+        return
+    
     # Load dataset
     print(f"Loading dataset from {args.input}...")
     text_data = load_dataset(args.input)
     
+    feature_counts = None
+    
     # Extract and sort features
     if args.feature == 'numbers':
         # Extract numbers and sort them
         print("Extracting numbers...")
         features = extract_numbers_from_text(text_data)
         
-        print(f"Sorting {len(features)} numbers using radix sort (base {args.base})...")
-        start_time = time.time()
-        sorted_features = radix_sort_numeric(features, base=args.base)
-        end_time = time.time()
-        
-        # Convert back to original representation for output
-        sorted_features = [str(num) if num % 1000 == 0 else f"{num/1000:.3f}" for num in sorted_features]
+        if args.sort_by == 'lexicographic':
+            print(f"Sorting {len(features)} numbers using radix sort (base {args.base})...")
+            start_time = time.time()
+            sorted_features, strategy = adaptive_sort(features, base=args.base)
+            end_time = time.time()
+            print(f"Sort strategy: {strategy}")
+            
+            # Convert back to original representation for output
+            sorted_features = [format_number(num) for num in sorted_features]
+        else:
+            print(f"Ranking {len(features)} numbers by {args.sort_by} using radix sort...")
+            start_time = time.time()
+            if args.sort_by == 'length':
+                features = [format_number(num) for num in features]
+            ranked = sort_features(Counter(features), args.sort_by)
+            end_time = time.time()
+            
+            sorted_features = [format_number(num) for num, _ in ranked]
+            feature_counts = [count for _, count in ranked]
     else:
-        # Preprocess text for other feature types
-        print("Preprocessing text...")
-        processed_text = preprocess_text(text_data)
-        
-        # Extract features
+        # Intern the features and count them in one pass over the text
         print(f"Extracting {args.feature}...")
-        if args.feature == 'ngrams':
-            features = extract_features(processed_text, feature_type=args.feature, n=args.ngram_size)
-        else:
-            features = extract_features(processed_text, feature_type=args.feature)
+        vocabulary = build_vocabulary(text_data, feature_type=args.feature, n=args.ngram_size)
         
-        # Sort using radix sort
-        print("Sorting features using radix sort...")
+        print(f"Sorting {len(vocabulary)} features by {args.sort_by} using radix sort...")
         start_time = time.time()
-        sorted_features = radix_sort_strings(features)
+        ids, strategy = vocabulary.sorted_ids(args.sort_by)
         end_time = time.time()
+        print(f"Sort strategy: {strategy}")
+        
+        sorted_features = vocabulary.materialize(ids)
+        if args.sort_by != 'lexicographic':
+            feature_counts = vocabulary.counts_of(ids)
     
     print(f"Sorting completed in {end_time - start_time:.4f} seconds")
     print(f"Sorted {len(sorted_features)} items")
     
     # Save results
     print(f"Saving results to {args.output}...")
-    save_results(sorted_features, args.output)
+    save_results(sorted_features, args.output, feature_counts)
     
     print("Processing complete!")
 
@@ -8,10 +8,34 @@ The implementation includes:
 1. radix_sort_numeric - For sorting numbers with customizable base
 2. radix_sort_strings - For sorting text strings efficiently
 3. Helper functions for counting sort and small array optimization
+4. numpy_radix_sort - Vectorized LSD engine used when NumPy is installed
+5. sort_features - Multi-key ordering of counted features (frequency, length)
+6. radix_sort_floats - Exact sorting of doubles via order-preserving bit keys
+7. radix_topk - The first k items in order, without sorting the rest
 """
 
-import math
-import multiprocessing
+import heapq
+import struct
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python passes are used instead
+    np = None
+
+SIGN_BIT = 1 << 63
+FLOAT_MASK = (1 << 64) - 1
+
+# Every int up to this magnitude converts to a float exactly
+MAX_EXACT_FLOAT_INT = 1 << 53
+
+# Numeric inputs smaller than this are sorted with insertion sort
+NUMERIC_INSERTION_CUTOFF = 1000
+
+# Buckets smaller than this are finished with insertion sort
+MSD_CUTOFF = 32
+
+SORT_ORDERS = ("lexicographic", "frequency", "length")
 
 def insertion_sort(arr):
     """
@@ -34,10 +58,14 @@ def insertion_sort(arr):
 
 def get_optimal_base(arr):
     """
-    Calculate the optimal base for radix sort based on the maximum value.
+    Calculate the optimal base for radix sort from the key range and size.
+    
+    Each pass scans the input once plus the count table once, so the base
+    (a power of two from 16 to 65536) minimising passes * (n + base) is
+    chosen: small inputs get small count tables, large inputs fewer passes.
     
     Args:
-        arr: List of numbers
+        arr: List of integers
         
     Returns:
         Optimal base for radix sort
@@ -45,89 +73,160 @@ def get_optimal_base(arr):
     if not arr:
         return 10
     
-    max_val = max(abs(x) for x in arr)
-    if max_val == 0:
+    key_range = int(max(arr) - min(arr))
+    if key_range == 0:
         return 10
+    
+    bits = key_range.bit_length()
+    n = len(arr)
+    best_base, best_cost = 16, None
+    for digit_bits in range(4, 17):
+        passes = -(-bits // digit_bits)
+        cost = passes * (n + (1 << digit_bits))
+        if best_cost is None or cost < best_cost:
+            best_base, best_cost = 1 << digit_bits, cost
+    return best_base
+
+def counting_sort_small_range(arr, min_val=None, max_val=None):
+    """
+    Counting sort for integers drawn from a small range.
+    
+    One pass counts every value and one pass over the range writes them
+    back, so the cost is O(n + max_val - min_val).
+    
+    Args:
+        arr: List of integers
+        min_val: Smallest value in arr (computed if omitted)
+        max_val: Largest value in arr (computed if omitted)
         
-    log_val = math.log2(max_val)
-    optimal_base = int(2 ** min(8, max(4, math.floor(log_val / 2))))
-    return min(optimal_base, 256)
+    Returns:
+        Sorted list
+    """
+    if not arr:
+        return arr
+
+    if min_val is None:
+        min_val = min(arr)
+    if max_val is None:
+        max_val = max(arr)
 
-def parallel_counting_sort(arr, exp, base):
+    count = [0] * (max_val - min_val + 1)
+    for num in arr:
+        count[num - min_val] += 1
+
+    output = []
+    for offset, occurrences in enumerate(count):
+        if occurrences:
+            output.extend([min_val + offset] * occurrences)
+    return output
+
+def counting_sort_pass(arr, exp, base, offset=0):
     """
-    Parallel counting sort implementation for a specific digit position.
+    Sequential counting sort for a specific digit position.
     
     Args:
         arr: List to sort
         exp: Current digit position (as a power of base)
         base: Number base to use
+        offset: Value subtracted from every number before extracting digits
         
     Returns:
         None (sorts in-place)
     """
-    if not arr:
-        return
-        
     n = len(arr)
     output = [0] * n
     count = [0] * base
 
+    for num in arr:
+        index = ((num - offset) // exp) % base
+        count[index] += 1
+
+    for i in range(1, base):
+        count[i] += count[i - 1]
+
+    for i in reversed(range(n)):
+        index = ((arr[i] - offset) // exp) % base
+        count[index] -= 1
+        output[count[index]] = arr[i]
+
+    arr[:] = output
+
+def numpy_radix_sort(arr, base=None):
+    """
+    Vectorized LSD radix sort over a NumPy int64 buffer.
+    
+    Signed values are mapped to order-preserving unsigned keys by flipping
+    the sign bit and rebased on the smallest key, so no pass is spent on
+    leading zero digits. Each pass extracts the digit column in one
+    operation, histograms it with bincount (a pass where every key shares
+    the same digit is skipped) and applies a stable counting scatter.
+    
+    Args:
+        arr: List of integers to sort
+        base: Number base to use (defaults to get_optimal_base)
+        
+    Returns:
+        Sorted list, or None if the input does not fit in 64-bit integers
+        and the caller should use the pure-Python passes instead
+    """
+    if np is None:
+        return None
+
     try:
-        num_threads = min(multiprocessing.cpu_count(), len(arr))
-        chunk_size = (len(arr) + num_threads - 1) // num_threads
-        chunks = [arr[i * chunk_size:(i + 1) * chunk_size] for i in range(num_threads)]
-
-        def count_chunk(chunk, result_queue):
-            local_count = [0] * base
-            for num in chunk:
-                index = (num // exp) % base
-                local_count[index] += 1
-            result_queue.put(local_count)
-
-        result_queue = multiprocessing.Queue()
-        processes = [multiprocessing.Process(target=count_chunk, args=(chunk, result_queue)) for chunk in chunks]
-        for p in processes: p.start()
-        for p in processes: p.join()
-
-        while not result_queue.empty():
-            local_count = result_queue.get()
-            for i in range(base):
-                count[i] += local_count[i]
-
-        for i in range(1, base):
-            count[i] += count[i - 1]
-
-        for i in reversed(range(n)):
-            index = (arr[i] // exp) % base
-            count[index] -= 1
-            output[count[index]] = arr[i]
-
-        for i in range(n):
-            arr[i] = output[i]
-            
-    except Exception as e:
-        # Fallback to sequential counting sort if parallel processing fails
-        for num in arr:
-            index = (num // exp) % base
-            count[index] += 1
-
-        for i in range(1, base):
-            count[i] += count[i - 1]
-
-        for i in reversed(range(n)):
-            index = (arr[i] // exp) % base
-            count[index] -= 1
-            output[count[index]] = arr[i]
-
-        for i in range(n):
-            arr[i] = output[i]
-
-def radix_sort_numeric(arr):
+        values = np.asarray(arr)
+    except (OverflowError, ValueError):
+        return None
+
+    if values.ndim != 1 or values.dtype.kind not in "iu":
+        return None
+
+    signed = values.dtype.kind == "i"
+    if signed:
+        keys = values.astype(np.int64).view(np.uint64) ^ np.uint64(SIGN_BIT)
+    else:
+        keys = values.astype(np.uint64)
+
+    if base is None:
+        base = get_optimal_base(arr)
+
+    n = len(keys)
+    min_key = keys.min()
+    keys -= min_key
+    max_key = int(keys.max())
+
+    if base <= 256:
+        digit_type = np.uint8
+    elif base <= 65536:
+        digit_type = np.uint16
+    else:
+        digit_type = np.uint64
+
+    np_base = np.uint64(base)
+    exp = 1
+    while max_key // exp > 0:
+        digits = ((keys // np.uint64(exp)) % np_base).astype(digit_type)
+        counts = np.bincount(digits, minlength=base)
+        if counts.max() < n:
+            # Stable sort on a narrow integer column is NumPy's counting
+            # sort: histogram, prefix sum and scatter done in C
+            keys = keys[np.argsort(digits, kind="stable")]
+        exp *= base
+
+    keys += min_key
+    if signed:
+        return (keys ^ np.uint64(SIGN_BIT)).view(np.int64).tolist()
+    return keys.tolist()
+
+def radix_sort_numeric(arr, base=None):
     """
     Optimized radix sort implementation for numeric data.
     
+    Uses the vectorized NumPy engine when NumPy is installed and falls back
+    to the pure-Python counting sort passes otherwise.
+    
     Args:
         arr: List of numbers to sort
+        base: Number base to use (defaults to get_optimal_base)
         
     Returns:
         Sorted list
@@ -135,74 +234,467 @@ def radix_sort_numeric(arr):
     if not arr:
         return arr
 
-    if len(arr) < 1000:
+    if base is not None and base < 2:
+        raise ValueError(f"Radix sort base must be at least 2, got {base}")
+
+    if len(arr) < NUMERIC_INSERTION_CUTOFF:
         return insertion_sort(arr.copy())
 
-    base = get_optimal_base(arr)
-    min_val = min(arr)
-    if min_val < 0:
-        arr = [num - min_val for num in arr]
+    result = numpy_radix_sort(arr, base)
+    if result is not None:
+        return result
 
-    max_val = max(arr)
-    exp = 1
+    if base is None:
+        base = get_optimal_base(arr)
 
+    # Digits are taken from (num - min_val) on the fly, so negative numbers
+    # sort correctly without building shifted copies of the list
+    min_val = min(arr)
+    max_val = max(arr) - min_val
+    exp = 1
     while max_val // exp > 0:
-        parallel_counting_sort(arr, exp, base)
+        counting_sort_pass(arr, exp, base, min_val)
         exp *= base
 
-    if min_val < 0:
-        arr = [num + min_val for num in arr]
-
     return arr
 
-def counting_sort_by_position(arr, position):
+def float_to_key(value):
     """
-    Counting sort implementation for a specific character position.
+    Map a double to an unsigned 64-bit key with the same ordering.
+    
+    Positive numbers get their sign bit set; negative numbers have all bits
+    flipped, so larger magnitudes give smaller keys.
     
     Args:
-        arr: List of (padded_string, original_string) tuples
-        position: The character position to sort by
+        value: Float to convert
         
     Returns:
-        Sorted list of (padded_string, original_string) tuples
+        Integer key in [0, 2**64)
     """
-    count = [0] * 256
-    for padded, _ in arr:
-        char = padded[position]
-        count[ord(char)] += 1
+    bits = struct.unpack("<Q", struct.pack("<d", value))[0]
+    return bits ^ FLOAT_MASK if bits & SIGN_BIT else bits | SIGN_BIT
 
-    for i in range(1, 256):
-        count[i] += count[i - 1]
+def _numpy_radix_sort_floats(arr):
+    """
+    Byte-wise LSD radix sort of doubles on NumPy's uint64 view.
+    
+    The key transform is applied in place on the bit pattern of the buffer,
+    and the passes ping-pong between that buffer and one scratch buffer.
+    
+    Args:
+        arr: List of numbers to sort
+        
+    Returns:
+        Sorted list of floats
+    """
+    keys = np.array(arr, dtype=np.float64).view(np.uint64)
+    negative = (keys >> np.uint64(63)).astype(bool)
+    np.invert(keys, out=keys, where=negative)
+    np.bitwise_or(keys, np.uint64(SIGN_BIT), out=keys, where=~negative)
+
+    n = len(keys)
+    scratch = np.empty_like(keys)
+    for shift in range(0, 64, 8):
+        digits = ((keys >> np.uint64(shift)) & np.uint64(0xFF)).astype(np.uint8)
+        if np.bincount(digits, minlength=256).max() == n:
+            continue
+        np.take(keys, np.argsort(digits, kind="stable"), out=scratch)
+        keys, scratch = scratch, keys
+
+    negative = ~(keys >> np.uint64(63)).astype(bool)
+    np.invert(keys, out=keys, where=negative)
+    np.bitwise_xor(keys, np.uint64(SIGN_BIT), out=keys, where=~negative)
+    return keys.view(np.float64).tolist()
+
+def radix_sort_floats(arr):
+    """
+    Radix sort for floating point data, including negatives and exponents.
+    
+    Every value is mapped to an order-preserving unsigned 64-bit key (see
+    float_to_key) and the keys are sorted with one counting pass per byte,
+    skipping bytes that are the same for every key. No scaling is applied,
+    so the values sort exactly.
+    
+    Args:
+        arr: List of numbers to sort
+        
+    Returns:
+        Sorted list of floats
+    """
+    if not arr:
+        return arr
 
-    output = [None] * len(arr)
-    for i in range(len(arr) - 1, -1, -1):
-        padded, original = arr[i]
-        char = padded[position]
-        output[count[ord(char)] - 1] = (padded, original)
-        count[ord(char)] -= 1
+    if len(arr) < NUMERIC_INSERTION_CUTOFF:
+        return insertion_sort([float(num) for num in arr])
 
-    return output
+    if np is not None:
+        return _numpy_radix_sort_floats(arr)
 
-def radix_sort_strings(arr):
+    # Same transform as float_to_key, applied to the raw bit patterns
+    bits = memoryview(array("d", arr)).cast("B").cast("Q").tolist()
+    keys = [b ^ FLOAT_MASK if b & SIGN_BIT else b | SIGN_BIT for b in bits]
+    for exp in (256 ** i for i in range(8)):
+        first = (keys[0] // exp) % 256
+        if any((key // exp) % 256 != first for key in keys):
+            counting_sort_pass(keys, exp, 256)
+
+    bits = array("Q", [k ^ SIGN_BIT if k & SIGN_BIT else k ^ FLOAT_MASK for k in keys])
+    return memoryview(bits).cast("B").cast("d").tolist()
+
+def _ints_fit_float(arr):
+    """Check that every int in a list of numbers converts to a float exactly."""
+    return all(-MAX_EXACT_FLOAT_INT <= num <= MAX_EXACT_FLOAT_INT
+               for num in arr if isinstance(num, int))
+
+def radix_sort_numbers(arr, base=None):
     """
-    Radix sort implementation for strings.
+    Sort a list of integers and/or floats with the matching radix sort.
+    
+    Integer-only input uses radix_sort_numeric and stays exact at any size;
+    input containing floats uses radix_sort_floats, which returns floats.
+    Floats mixed with integers beyond 2**53 (which would be rounded, or not
+    fit a double at all) are sorted by exact comparison instead.
+    
+    Args:
+        arr: List of numbers to sort
+        base: Number base for integer sorting (defaults to get_optimal_base)
+        
+    Returns:
+        Sorted list
+    """
+    if all(isinstance(num, int) for num in arr):
+        return radix_sort_numeric(arr, base)
+    if not _ints_fit_float(arr):
+        return sorted(arr)
+    return radix_sort_floats(arr)
+
+def american_flag_partition(arr, lo, hi, depth):
+    """
+    Partition arr[lo:hi] in place by the byte at `depth`.
+    
+    Keys that end before `depth` go to bucket 0, ahead of every byte
+    value, so shorter keys sort before their extensions.
+    
+    Args:
+        arr: List of UTF-8 encoded byte strings, modified in place
+        lo: Start of the range to partition
+        hi: End of the range to partition (exclusive)
+        depth: The character position to partition by
+        
+    Returns:
+        List of (start, end) bucket bounds, indexed by bucket
+    """
+    keys = [key[depth] + 1 if depth < len(key) else 0 for key in arr[lo:hi]]
+
+    count = [0] * 257
+    for key in keys:
+        count[key] += 1
+
+    bounds = []
+    next_slot = [0] * 257
+    position = 0
+    for bucket in range(257):
+        next_slot[bucket] = position
+        bounds.append((lo + position, lo + position + count[bucket]))
+        position += count[bucket]
+
+    # Cycle every misplaced string into the next free slot of its bucket
+    for bucket in range(257):
+        end = bounds[bucket][1] - lo
+        while next_slot[bucket] < end:
+            i = next_slot[bucket]
+            key = keys[i]
+            while key != bucket:
+                j = next_slot[key]
+                next_slot[key] += 1
+                arr[lo + i], arr[lo + j] = arr[lo + j], arr[lo + i]
+                keys[i], keys[j] = keys[j], key
+                key = keys[i]
+            next_slot[bucket] += 1
+
+    return bounds
+
+def partial_radix_sort_strings(arr, k):
+    """
+    Partial MSD radix sort: return the first k strings in sorted order.
+    
+    Works like radix_sort_strings, but a bucket is only refined when it
+    overlaps the first k positions; buckets that lie entirely past k are
+    left unsorted and dropped.
     
     Args:
         arr: List of strings to sort
+        k: Number of leading strings to produce (None for all)
         
     Returns:
-        Sorted list of strings
+        Sorted list of the first k strings
     """
     if not arr:
         return arr
 
-    if len(arr) < 32:
-        return insertion_sort(arr.copy())
+    if k is None or k > len(arr):
+        k = len(arr)
+
+    # surrogatepass keeps lone surrogates from PDF extraction sortable
+    arr = [s.encode("utf-8", "surrogatepass") for s in arr]
+    stack = [(0, len(arr), 0)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo < MSD_CUTOFF:
+            arr[lo:hi] = insertion_sort(arr[lo:hi])
+            continue
+
+        bounds = american_flag_partition(arr, lo, hi, depth)
+        # Bucket 0 holds strings that ended at this depth; they are equal
+        for start, end in bounds[1:]:
+            if start >= k:
+                break
+            if end - start > 1:
+                stack.append((start, end, depth + 1))
+
+    return [key.decode("utf-8", "surrogatepass") for key in arr[:k]]
 
-    max_length = max(len(s) for s in arr)
-    padded_arr = [(s.ljust(max_length), s) for s in arr]
+def radix_sort_strings(arr):
+    """
+    Radix sort implementation for strings.
+    
+    MSD (most-significant-digit) radix sort over UTF-8 encoded keys: the
+    keys are partitioned in place by their first byte, then each bucket is
+    partitioned by the next byte only where it still holds more than one
+    key. Buckets smaller than MSD_CUTOFF are finished with insertion sort,
+    so no key is ever padded and each one is only examined up to the length
+    of its distinguishing prefix. UTF-8 byte order equals code point order,
+    so any Unicode text sorts exactly as str comparison would.
+    
+    Args:
+        arr: List of strings to sort
+        
+    Returns:
+        Sorted list of strings
+    """
+    return partial_radix_sort_strings(arr, None)
+
+def _numpy_select_smallest(arr, k):
+    """
+    Vectorized MSD radix select over order-preserving 64-bit keys.
+    
+    Args:
+        arr: List of ints (fitting int64) and/or floats
+        k: Number of values to select
+        
+    Returns:
+        List of the k smallest values in no particular order, or None if
+        the input cannot be represented as 64-bit keys
+    """
+    values = np.asarray(arr)
+    if values.ndim != 1:
+        return None
+    if values.dtype.kind != "i" and all(isinstance(num, int) for num in arr):
+        # Ints beyond int64 come back as float64, which would round them
+        return None
+    if values.dtype.kind == "i":
+        keys = values.astype(np.int64).view(np.uint64) ^ np.uint64(SIGN_BIT)
+    elif values.dtype.kind == "f":
+        keys = values.astype(np.float64).view(np.uint64)
+        negative = (keys >> np.uint64(63)).astype(bool)
+        np.invert(keys, out=keys, where=negative)
+        np.bitwise_or(keys, np.uint64(SIGN_BIT), out=keys, where=~negative)
+    else:
+        return None
+
+    index = np.arange(len(keys))
+    selected = []
+    for shift in range(56, -8, -8):
+        if k == 0 or len(index) <= k:
+            break
+        digits = ((keys >> np.uint64(shift)) & np.uint64(0xFF)).astype(np.uint8)
+        cumulative = np.cumsum(np.bincount(digits, minlength=256))
+        # First bucket whose running total reaches k holds the boundary
+        boundary = int(np.searchsorted(cumulative, k))
+        below = digits < boundary
+        selected.append(index[below])
+        k -= int(cumulative[boundary - 1]) if boundary else 0
+        inside = digits == boundary
+        index, keys = index[inside], keys[inside]
+    selected.append(index[:k])
+
+    return values[np.concatenate(selected)].tolist()
+
+def _select_smallest(arr, k):
+    """
+    MSD radix select: the k smallest numbers, in no particular order.
+    
+    Numbers are bucketed by the top byte of their order-preserving key; the
+    buckets below the one containing the k-th number are taken whole and
+    only that boundary bucket is examined at the next byte.
+    
+    Args:
+        arr: List of numbers
+        k: Number of values to select
+        
+    Returns:
+        List of the k smallest values
+    """
+    if all(isinstance(num, int) for num in arr):
+        min_val = min(arr)
+        keys = [num - min_val for num in arr]
+    else:
+        keys = [float_to_key(float(num)) for num in arr]
+
+    shift = max(0, (max(keys).bit_length() + 7) // 8 * 8 - 8)
+    items = arr
+    selected = []
+    while k > 0 and len(items) > k:
+        bucket_items = [[] for _ in range(256)]
+        bucket_keys = [[] for _ in range(256)]
+        for item, key in zip(items, keys):
+            digit = (key >> shift) & 0xFF
+            bucket_items[digit].append(item)
+            bucket_keys[digit].append(key)
+
+        for digit in range(256):
+            if len(bucket_items[digit]) <= k:
+                selected.extend(bucket_items[digit])
+                k -= len(bucket_items[digit])
+            else:
+                items, keys = bucket_items[digit], bucket_keys[digit]
+                break
+        else:
+            items = []
+
+        if shift == 0:
+            # Everything left in the boundary bucket has the same key
+            break
+        shift -= 8
+
+    selected.extend(items[:k])
+    return selected
+
+def radix_topk(arr, k):
+    """
+    Return the k smallest items of arr in sorted order.
+    
+    Strings use the partial MSD sort; numbers use an MSD radix select to
+    find the k smallest values, and only those are radix sorted. Either way
+    the work past the first k items is a single bucketing pass rather than
+    a full sort.
+    
+    Args:
+        arr: List of strings or numbers
+        k: Number of items to return
+        
+    Returns:
+        Sorted list of the first k items
+    """
+    if not arr or k <= 0:
+        return []
+
+    if k >= len(arr):
+        return _radix_sort_keys(list(arr))
+
+    if isinstance(arr[0], str):
+        return partial_radix_sort_strings(arr, k)
+
+    if not all(isinstance(num, int) for num in arr) and not _ints_fit_float(arr):
+        # Floats mixed with ints that no 64-bit key can hold exactly; the
+        # unlimited sort compares these exactly too (see radix_sort_numbers)
+        return heapq.nsmallest(k, arr)
+
+    selected = None
+    if np is not None:
+        try:
+            selected = _numpy_select_smallest(arr, k)
+        except (OverflowError, ValueError):
+            selected = None
+    if selected is None:
+        selected = _select_smallest(arr, k)
+
+    return radix_sort_numbers(selected)
+
+def _radix_sort_keys(features):
+    """Sort a list of features with the radix sort matching their type."""
+    if features and isinstance(features[0], str):
+        return radix_sort_strings(features)
+    return radix_sort_numbers(features)
+
+def _ranked_by_bucket(counts, buckets, descending, k):
+    """
+    Emit (feature, count) pairs bucket by bucket, sorting within buckets.
+    
+    Args:
+        counts: Dict mapping feature -> occurrence count
+        buckets: Dict mapping primary key -> list of features
+        descending: Whether to visit the primary keys from largest to smallest
+        k: Stop once this many pairs have been produced (None for all)
+        
+    Returns:
+        List of (feature, count) tuples
+    """
+    order = radix_sort_numeric(list(buckets))
+    if descending:
+        order.reverse()
+
+    ranked = []
+    for key in order:
+        for feature in _radix_sort_keys(buckets[key]):
+            ranked.append((feature, counts[feature]))
+        if k is not None and len(ranked) >= k:
+            return ranked[:k]
+    return ranked
+
+def radix_sort_by_frequency(counts, k=None):
+    """
+    Sort counted features by count (descending), then by the feature itself.
+    
+    Features are grouped by count in a single pass; the distinct counts are
+    radix sorted and only the groups needed for the first k entries are
+    radix sorted internally.
+    
+    Args:
+        counts: Dict mapping feature -> occurrence count
+        k: Only return the first k entries (None for all)
+        
+    Returns:
+        List of (feature, count) tuples
+    """
+    buckets = {}
+    for feature, count in counts.items():
+        buckets.setdefault(count, []).append(feature)
+    return _ranked_by_bucket(counts, buckets, True, k)
 
-    for i in range(max_length - 1, -1, -1):
-        padded_arr = counting_sort_by_position(padded_arr, i)
+def radix_sort_by_length(counts, k=None):
+    """
+    Sort counted features by length (ascending), then by the feature itself.
+    
+    Args:
+        counts: Dict mapping feature -> occurrence count
+        k: Only return the first k entries (None for all)
+        
+    Returns:
+        List of (feature, count) tuples
+    """
+    buckets = {}
+    for feature in counts:
+        buckets.setdefault(len(str(feature)), []).append(feature)
+    return _ranked_by_bucket(counts, buckets, False, k)
 
-    return [original for _, original in padded_arr]
+def sort_features(counts, sort_by="lexicographic", k=None):
+    """
+    Sort counted features in one of the supported orders.
+    
+    Args:
+        counts: Dict mapping feature -> occurrence count
+        sort_by: 'lexicographic', 'frequency' or 'length'
+        k: Only return the first k entries (None for all)
+        
+    Returns:
+        List of (feature, count) tuples
+    """
+    if sort_by == "frequency":
+        return radix_sort_by_frequency(counts, k)
+    if sort_by == "length":
+        return radix_sort_by_length(counts, k)
+    if sort_by == "lexicographic":
+        ranked = [(feature, counts[feature]) for feature in _radix_sort_keys(list(counts))]
+        return ranked if k is None else ranked[:k]
+    raise ValueError(f"Unknown sort_by: {sort_by}")
@@ -0,0 +1,386 @@
+"""
+Result cache for summaries and sorted features
+
+Results are kept in an in-memory LRU and, when a cache directory is
+configured, also written to disk as JSON so they survive restarts and are
+shared between server processes. JSON rather than pickle means a tampered
+cache file can at worst yield wrong data, never run code; the directory
+must also be private to the server's user. Entries expire after a time-to-live and are
+evicted least-recently-used first once the size limits are reached: an
+approximate byte budget and an entry count in memory, and a byte budget
+on disk.
+Keys are SHA-256 hashes of the request content, so the UI's process ->
+export flow reuses the work done for the first call.
+
+The same cache class backs the result store, which keeps processed
+results under opaque handles for the export endpoints.
+"""
+
+import hashlib
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("NLP_CACHE_MAX_ENTRIES", "256"))
+DEFAULT_MAX_BYTES = int(os.environ.get("NLP_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+DEFAULT_TTL = float(os.environ.get("NLP_CACHE_TTL", "3600"))
+DEFAULT_DISK_BYTES = int(os.environ.get("NLP_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
+RESULT_STORE_ENTRIES = int(os.environ.get("NLP_RESULT_STORE_ENTRIES", "32"))
+RESULT_STORE_TTL = float(os.environ.get("NLP_RESULT_STORE_TTL", str(DEFAULT_TTL)))
+RESULT_STORE_BYTES = int(os.environ.get("NLP_RESULT_STORE_BYTES", str(256 * 1024 * 1024)))
+
+# Long lists are sized from this many evenly spaced items
+SIZE_SAMPLE_ITEMS = 64
+
+def make_key(*parts):
+    """
+    Hash the parts of a request into a cache key.
+
+    Args:
+        *parts: Strings, numbers, None or tuples/lists of them
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8", "surrogatepass") if isinstance(part, str) else repr(part).encode("utf-8")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+def estimate_size(value):
+    """
+    Approximate the memory held by a result.
+
+    Dicts are walked fully; lists and tuples are extrapolated from a
+    sample of their items, so sizing a million-feature result stays cheap.
+
+    Args:
+        value: Result made of dicts, lists, tuples, strings and numbers
+
+    Returns:
+        Estimated size in bytes
+    """
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(key) + estimate_size(item) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)) and value:
+        step = max(1, len(value) // SIZE_SAMPLE_ITEMS)
+        sample = value[::step][:SIZE_SAMPLE_ITEMS]
+        per_item = sum(estimate_size(item) for item in sample) / len(sample)
+        return sys.getsizeof(value) + int(per_item * len(value))
+    return sys.getsizeof(value)
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with TTL expiry and an optional disk tier.
+
+    The lock only guards the in-memory state; disk reads and writes happen
+    outside it, so threads using the memory tier never wait on disk I/O.
+
+    Attributes:
+        hits: Lookups answered from memory or disk
+        misses: Lookups that found nothing (or only an expired entry)
+        evictions: Entries dropped for size or age
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL,
+                 disk_dir=None, max_disk_bytes=DEFAULT_DISK_BYTES, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            max_bytes: Approximate memory the in-memory entries may hold
+                       (see estimate_size); larger entries only go to disk
+            ttl: Seconds an entry stays valid (None or 0 to never expire)
+            disk_dir: Directory for the disk tier (None for memory only);
+                      created with mode 0700, and an existing one that is
+                      not private to this user disables the disk tier
+            max_disk_bytes: Total size the disk tier is trimmed to
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory_bytes = 0
+        self.ttl = ttl or None
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if disk_dir and not self._open_disk_dir(disk_dir):
+            self.disk_dir = None
+
+    @staticmethod
+    def _open_disk_dir(disk_dir):
+        """
+        Create the disk tier's directory, or check that an existing one is private.
+
+        Args:
+            disk_dir: Directory path
+
+        Returns:
+            True if the directory is owned by this user and closed to others
+        """
+        try:
+            os.makedirs(disk_dir, mode=0o700, exist_ok=True)
+            info = os.lstat(disk_dir)
+        except OSError as e:
+            print(f"Could not create cache directory {disk_dir}: {e}; disk cache disabled")
+            return False
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+            print(f"Cache directory {disk_dir} must be a directory owned by this user "
+                  "with mode 0700; disk cache disabled")
+            return False
+        return True
+
+    def _expired(self, stored_at):
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _count_evictions(self, count=1):
+        with self._lock:
+            self.evictions += count
+
+    def _read_disk(self, key):
+        """Load an entry from the disk tier, dropping it if it has expired."""
+        path = self._disk_path(key)
+        try:
+            if self._expired(os.path.getmtime(path)):
+                os.remove(path)
+                self._count_evictions()
+                return None
+            with open(path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Could not read cache entry {key}: {e}")
+            return None
+
+    def _write_disk(self, key, value):
+        """Store an entry in the disk tier and trim it to max_disk_bytes; True if written."""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+        except OSError as e:
+            print(f"Could not write cache entry {key}: {e}")
+            return False
+        try:
+            with open(fd, "w", encoding="utf-8") as file:
+                json.dump(value, file)
+            # Atomic so other processes never read a half-written entry
+            os.replace(tmp_path, self._disk_path(key))
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Could not write cache entry {key}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+        self._trim_disk()
+        return True
+
+    def _trim_disk(self):
+        """Delete the oldest disk entries until the tier fits its size limit."""
+        try:
+            files = []
+            for entry in os.scandir(self.disk_dir):
+                if entry.name.endswith(".json"):
+                    info = entry.stat()
+                    files.append((info.st_mtime, info.st_size, entry.path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                # Another thread or process trimmed it first
+                pass
+            total -= size
+        if removed:
+            self._count_evictions(removed)
+
+    def get(self, key, default=None):
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key (see make_key)
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value, _ = entry
+                if not self._expired(stored_at):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+                self.evictions += 1
+
+        value = self._read_disk(key) if self.disk_dir else None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return default
+            self._store(key, value)
+            self.hits += 1
+            return value
+
+    def _remove(self, key):
+        """Drop an entry from the memory tier."""
+        _, _, size = self._entries.pop(key)
+        self.memory_bytes -= size
+
+    def _store(self, key, value):
+        """Insert into the memory tier and evict the least recently used; True if kept."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            # It would push out everything else; it is only kept on disk
+            return False
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.time(), value, size)
+        self.memory_bytes += size
+        while len(self._entries) > self.max_entries or self.memory_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        return True
+
+    def set(self, key, value):
+        """
+        Cache a result.
+
+        A value larger than max_bytes is not kept in memory; without a disk
+        tier it is not cached at all, and an earlier value for the key stays.
+
+        Args:
+            key: Cache key (see make_key)
+            value: JSON-serializable result; None is not cached
+
+        Returns:
+            True if the value was kept in memory or on disk
+        """
+        if value is None:
+            return False
+        with self._lock:
+            kept = self._store(key, value)
+        if self.disk_dir:
+            kept = self._write_disk(key, value) or kept
+        return kept
+
+    def get_or_compute(self, key, compute):
+        """
+        Get a cached result, computing and caching it on a miss.
+
+        Args:
+            key: Cache key (see make_key)
+            compute: Function with no arguments producing the result
+
+        Returns:
+            The cached or freshly computed value
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        """Drop every entry from memory and disk."""
+        with self._lock:
+            self._entries.clear()
+            self.memory_bytes = 0
+        if self.disk_dir:
+            for entry in os.scandir(self.disk_dir):
+                if entry.name.endswith(".json"):
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+
+    def stats(self):
+        """
+        Get the cache counters.
+
+        Returns:
+            Dictionary with entries, memory_bytes, hits, misses, evictions
+            and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "memory_bytes": self.memory_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "disk_dir": self.disk_dir,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+_cache = None
+
+def get_result_cache():
+    """
+    Get the process-wide result cache, creating it on first use.
+
+    The disk tier is enabled by setting NLP_CACHE_DIR.
+
+    Returns:
+        ResultCache instance
+    """
+    global _cache
+    if _cache is None:
+        _cache = ResultCache(disk_dir=os.environ.get("NLP_CACHE_DIR") or None)
+    return _cache
+
+_result_store = None
+
+def get_result_store():
+    """
+    Get the process-wide store of result handles, creating it on first use.
+
+    Unlike the result cache, entries are keyed by the random handles that
+    /api/process hands out, so export requests can refer to a result
+    without resending its text. Set NLP_CACHE_DIR to keep the entries on
+    disk as well, which lets every server worker resolve every handle.
+
+    Returns:
+        ResultCache instance
+    """
+    global _result_store
+    if _result_store is None:
+        cache_dir = os.environ.get("NLP_CACHE_DIR")
+        _result_store = ResultCache(
+            max_entries=RESULT_STORE_ENTRIES,
+            ttl=RESULT_STORE_TTL,
+            max_bytes=RESULT_STORE_BYTES,
+            disk_dir=os.path.join(cache_dir, "results") if cache_dir else None
+        )
+    return _result_store
@@ -1,3 +1,4 @@
+import argparse
 import subprocess
 import os
 import sys
@@ -5,11 +6,14 @@ import webbrowser
 import time
 import threading
 
-def run_backend():
+def run_backend(mode="dev", workers=None):
     """Run the FastAPI backend server"""
-    print("Starting backend server...")
+    print(f"Starting backend server in {mode} mode...")
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
-    subprocess.run([sys.executable, "api.py"])
+    command = [sys.executable, "api.py", "--mode", mode]
+    if workers:
+        command += ["--workers", str(workers)]
+    subprocess.run(command)
 
 def run_frontend():
     """Run the React frontend dev server"""
@@ -26,6 +30,12 @@ def open_browser():
     webbrowser.open("http://localhost:3000")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run the ML Data Convertor web app')
+    parser.add_argument('--mode', choices=['dev', 'prod'], default='dev',
+                        help='Backend mode: dev (auto-reload) or prod (multiple workers)')
+    parser.add_argument('--workers', '-w', type=int, help='Backend worker processes in prod mode')
+    args = parser.parse_args()
+    
     # Check if frontend dependencies are installed
     frontend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
     if not os.path.exists(os.path.join(frontend_dir, "node_modules")):
@@ -37,7 +47,7 @@ if __name__ == "__main__":
             subprocess.run(["npm", "install"])
     
     # Start backend in a separate thread
-    backend_thread = threading.Thread(target=run_backend)
+    backend_thread = threading.Thread(target=run_backend, args=(args.mode, args.workers))
     backend_thread.daemon = True
     backend_thread.start()
     
@@ -0,0 +1,153 @@
+"""
+Launcher for the API server in development or production mode
+
+dev:  one uvicorn process with auto-reload.
+prod: several worker processes. With gunicorn installed the app (and the
+      lazily loaded NLTK/summa/report libraries, see api.warm_up) is loaded
+      once in the master and forked into UvicornWorker processes that are
+      recycled after a number of requests; otherwise uvicorn's own
+      multi-process mode is used and every worker warms up on startup.
+
+The result handles /api/process hands out must resolve on whichever worker
+gets the export request, so prod mode always gives the result cache and
+result store a disk tier shared by the workers: NLP_CACHE_DIR, or else a
+private directory created for this run (mode 0700, random name) and
+removed when the server exits. A fixed path in the shared temp directory
+is never used, since another user could create it first.
+"""
+
+import argparse
+import importlib.util
+import os
+import shutil
+import tempfile
+
+DEFAULT_HOST = os.environ.get("NLP_SERVER_HOST", "0.0.0.0")
+DEFAULT_PORT = int(os.environ.get("NLP_SERVER_PORT", "8000"))
+# Restart a worker after this many requests to cap memory growth (0 = never)
+DEFAULT_MAX_REQUESTS = int(os.environ.get("NLP_SERVER_MAX_REQUESTS", "1000"))
+# Seconds a worker gets to finish in-flight requests on shutdown or recycle
+DEFAULT_GRACEFUL_TIMEOUT = int(os.environ.get("NLP_SERVER_GRACEFUL_TIMEOUT", "30"))
+SERVER_MODES = ("dev", "prod")
+
+def default_workers():
+    """
+    Get the number of server worker processes for production mode.
+
+    Returns:
+        NLP_SERVER_WORKERS if set, otherwise the CPU count
+    """
+    configured = int(os.environ.get("NLP_SERVER_WORKERS", "0"))
+    return configured if configured > 0 else (os.cpu_count() or 1)
+
+def run_dev(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Run a single auto-reloading uvicorn server."""
+    import uvicorn
+    uvicorn.run("api:app", host=host, port=port, reload=True)
+
+def _run_gunicorn(host, port, workers, max_requests, graceful_timeout):
+    """Run gunicorn with a preloaded, warmed-up app and UvicornWorker workers."""
+    from gunicorn.app.base import BaseApplication
+
+    class ApiApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Runs once in the master because of preload_app; the workers
+            # are forked with everything already imported and resolved
+            import api
+            timings = api.warm_up()
+            details = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+            print(f"Preloaded app: {details}")
+            return api.app
+
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "max_requests": max_requests,
+        # Spread the restarts so the workers are not all recycled at once
+        "max_requests_jitter": max(1, max_requests // 10) if max_requests else 0,
+        "graceful_timeout": graceful_timeout,
+        "timeout": 300,
+    }
+    ApiApplication(options).run()
+
+def _run_uvicorn_workers(host, port, workers, max_requests, graceful_timeout):
+    """Run uvicorn's multi-process mode (no preloading, no recycling)."""
+    import uvicorn
+
+    if max_requests:
+        # uvicorn's supervisor does not replace workers that exit, so
+        # recycling would shut the server down one worker at a time
+        print("Worker recycling needs gunicorn (pip install gunicorn); running without it")
+
+    # Each worker process imports the app itself, so each one warms up
+    os.environ.setdefault("NLP_WARM_UP", "1")
+    uvicorn.run(
+        "api:app",
+        host=host,
+        port=port,
+        workers=workers,
+        timeout_graceful_shutdown=graceful_timeout,
+    )
+
+def run_prod(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None,
+             max_requests=DEFAULT_MAX_REQUESTS, graceful_timeout=DEFAULT_GRACEFUL_TIMEOUT):
+    """
+    Run the API with several worker processes.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind
+        workers: Number of worker processes (default_workers() if None)
+        max_requests: Recycle a worker after this many requests (0 = never)
+        graceful_timeout: Seconds to let in-flight requests finish
+    """
+    workers = workers or default_workers()
+    # Inherited by every worker, so they all share one result store
+    private_dir = None
+    cache_dir = os.environ.get("NLP_CACHE_DIR")
+    if not cache_dir:
+        private_dir = cache_dir = os.environ["NLP_CACHE_DIR"] = tempfile.mkdtemp(prefix="nlp_cache_")
+    print(f"Sharing cached results between workers in {cache_dir}")
+
+    try:
+        if importlib.util.find_spec("gunicorn") is None:
+            print(f"gunicorn not installed; starting {workers} uvicorn workers")
+            _run_uvicorn_workers(host, port, workers, max_requests, graceful_timeout)
+            return
+
+        print(f"Starting gunicorn with {workers} workers")
+        _run_gunicorn(host, port, workers, max_requests, graceful_timeout)
+    finally:
+        if private_dir:
+            shutil.rmtree(private_dir, ignore_errors=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the ML Data Convertor API server')
+    parser.add_argument('--mode', choices=SERVER_MODES, default=os.environ.get('NLP_SERVER_MODE', 'dev'),
+                        help='dev: single auto-reloading server; prod: multiple workers')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='Interface to bind')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port to bind')
+    parser.add_argument('--workers', '-w', type=int, help='Worker processes in prod mode (default: CPU count)')
+    parser.add_argument('--max-requests', type=int, default=DEFAULT_MAX_REQUESTS,
+                        help='Recycle a prod worker after this many requests (0 disables)')
+    parser.add_argument('--graceful-timeout', type=int, default=DEFAULT_GRACEFUL_TIMEOUT,
+                        help='Seconds to let in-flight requests finish on shutdown')
+    args = parser.parse_args(argv)
+
+    if args.mode == 'prod':
+        run_prod(args.host, args.port, args.workers, args.max_requests, args.graceful_timeout)
+    else:
+        run_dev(args.host, args.port)
+
+if __name__ == "__main__":
+    main()
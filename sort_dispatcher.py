@@ -0,0 +1,186 @@
+"""
+Adaptive sort dispatcher
+
+Samples the input and picks the cheapest sorting strategy for it:
+already-sorted or reversed input is returned as is, small inputs use
+insertion sort, integers from a small range use counting sort, other
+numbers go to LSD radix sort and strings to MSD radix sort (or the
+builtin timsort for nearly sorted data). The thresholds are read from a
+calibration file that benchmark_sort.py --write-calibration regenerates.
+"""
+
+import json
+import os
+import random
+
+import radix_sort
+from radix_sort import (
+    insertion_sort, radix_sort_numbers, radix_sort_strings, counting_sort_small_range
+)
+
+CALIBRATION_PATH = os.environ.get(
+    "SORT_CALIBRATION_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "sort_calibration.json")
+)
+
+DEFAULT_CALIBRATION = {
+    # Inputs shorter than this go to insertion sort
+    "numeric_insertion_cutoff": 1000,
+    "string_insertion_cutoff": 32,
+    # MSD buckets smaller than this are finished with insertion sort
+    "msd_cutoff": 32,
+    # Counting sort is used when max - min <= factor * len(arr)
+    "counting_sort_range_factor": 2,
+    # Fraction of sampled adjacent pairs in order above which timsort wins
+    "presorted_sample_ratio": 0.9,
+    "sample_size": 256,
+}
+
+STRATEGIES = (
+    "empty", "insertion_sort", "already_sorted", "reversed", "counting_sort",
+    "lsd_radix", "msd_radix", "timsort"
+)
+
+_calibration = None
+
+def load_calibration(path=None):
+    """
+    Load the sort thresholds, falling back to the defaults for missing keys.
+
+    Args:
+        path: Calibration JSON file (CALIBRATION_PATH if omitted)
+
+    Returns:
+        Dictionary of thresholds
+    """
+    calibration = dict(DEFAULT_CALIBRATION)
+    path = path or CALIBRATION_PATH
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            stored = json.load(file)
+        calibration.update({key: value for key, value in stored.items() if key in DEFAULT_CALIBRATION})
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"Could not read sort calibration from {path}: {e}")
+    return calibration
+
+def apply_calibration(calibration):
+    """
+    Make a calibration the active one, including the radix_sort cutoffs.
+
+    Args:
+        calibration: Dictionary of thresholds (see DEFAULT_CALIBRATION)
+    """
+    global _calibration
+    _calibration = calibration
+    radix_sort.NUMERIC_INSERTION_CUTOFF = calibration["numeric_insertion_cutoff"]
+    radix_sort.MSD_CUTOFF = calibration["msd_cutoff"]
+
+def get_calibration():
+    """Get the active calibration, loading it on first use."""
+    if _calibration is None:
+        apply_calibration(load_calibration())
+    return _calibration
+
+def save_calibration(calibration, path=None):
+    """
+    Write a calibration file.
+
+    Args:
+        calibration: Dictionary of thresholds
+        path: Destination (CALIBRATION_PATH if omitted)
+    """
+    with open(path or CALIBRATION_PATH, 'w', encoding='utf-8') as file:
+        json.dump(calibration, file, indent=2)
+        file.write("\n")
+
+def _sample_indices(n, sample_size):
+    """Pick the positions of the adjacent pairs to sample, in order."""
+    if n <= sample_size:
+        return list(range(n - 1))
+    return sorted(random.sample(range(n - 1), sample_size))
+
+def _run_order(arr, indices):
+    """Count sampled adjacent pairs that are ascending and descending."""
+    ascending = descending = 0
+    for i in indices:
+        if arr[i] <= arr[i + 1]:
+            ascending += 1
+        if arr[i] >= arr[i + 1]:
+            descending += 1
+    return ascending, descending
+
+def _is_sorted(arr, reverse=False):
+    """Check the whole list for ascending (or descending) order."""
+    if reverse:
+        return all(arr[i] >= arr[i + 1] for i in range(len(arr) - 1))
+    return all(arr[i] <= arr[i + 1] for i in range(len(arr) - 1))
+
+def choose_strategy(arr):
+    """
+    Pick a sorting strategy for arr from a sample of it.
+
+    Args:
+        arr: List of strings, or of ints and/or floats
+
+    Returns:
+        One of STRATEGIES
+    """
+    calibration = get_calibration()
+    n = len(arr)
+    if n == 0:
+        return "empty"
+
+    is_text = isinstance(arr[0], str)
+    cutoff = calibration["string_insertion_cutoff"] if is_text else calibration["numeric_insertion_cutoff"]
+    if n < cutoff:
+        return "insertion_sort"
+
+    indices = _sample_indices(n, calibration["sample_size"])
+    ascending, descending = _run_order(arr, indices)
+    # A fully ordered sample is confirmed with one linear scan
+    if ascending == len(indices) and _is_sorted(arr):
+        return "already_sorted"
+    if descending == len(indices) and _is_sorted(arr, reverse=True):
+        return "reversed"
+    if ascending >= calibration["presorted_sample_ratio"] * len(indices):
+        return "timsort"
+
+    if is_text:
+        # MSD never pads keys, so one long key the sample missed cannot slow it down
+        return "msd_radix"
+
+    if all(isinstance(num, int) for num in arr):
+        if max(arr) - min(arr) <= calibration["counting_sort_range_factor"] * n:
+            return "counting_sort"
+    return "lsd_radix"
+
+def adaptive_sort(arr, base=None):
+    """
+    Sort arr with the strategy choose_strategy picks for it.
+
+    Args:
+        arr: List of strings, or of ints and/or floats
+        base: Number base for integer radix sort (defaults to get_optimal_base)
+
+    Returns:
+        (sorted_list, strategy_name)
+    """
+    strategy = choose_strategy(arr)
+
+    if strategy == "empty":
+        return list(arr), strategy
+    if strategy == "insertion_sort":
+        return insertion_sort(list(arr)), strategy
+    if strategy == "already_sorted":
+        return list(arr), strategy
+    if strategy == "reversed":
+        return arr[::-1], strategy
+    if strategy == "timsort":
+        return sorted(arr), strategy
+    if strategy == "counting_sort":
+        return counting_sort_small_range(arr), strategy
+    if strategy == "msd_radix":
+        return radix_sort_strings(arr), strategy
+    return radix_sort_numbers(list(arr), base), strategy
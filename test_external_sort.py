@@ -0,0 +1,35 @@
+"""
+Regression tests for external_sort
+"""
+
+import random
+
+from external_sort import external_sort_numbers, external_sort_strings, parse_memory_limit
+
+def test_ints_sharing_a_double_sort_exactly():
+    numbers = [2 ** 60 + i for i in range(3000)][::-1]
+    assert list(external_sort_numbers(numbers, memory_limit=5000)) == sorted(numbers)
+
+def test_ints_beyond_double_range():
+    numbers = [10 ** 400 + i for i in range(200)][::-1] + [-10 ** 400 - i for i in range(200)]
+    numbers += [float("inf"), float("-inf"), 1.5, 2 ** 1024, -(2 ** 1024)]
+    assert list(external_sort_numbers(numbers, memory_limit=5000)) == sorted(numbers)
+
+def test_mixed_numbers_spill_to_disk():
+    rng = random.Random(1)
+    numbers = [
+        rng.choice([rng.randint(-2 ** 70, 2 ** 70), rng.random() * 1e20, rng.randint(-5, 5)])
+        for _ in range(10000)
+    ]
+    assert list(external_sort_numbers(numbers, memory_limit=20000)) == sorted(numbers)
+    assert list(external_sort_numbers(numbers, memory_limit=20000, unique=True)) == sorted(set(numbers))
+
+def test_strings_spill_to_disk():
+    rng = random.Random(2)
+    words = [str(rng.randint(0, 500)) for _ in range(10000)]
+    assert list(external_sort_strings(words, memory_limit=5000)) == sorted(set(words))
+
+def test_parse_memory_limit():
+    assert parse_memory_limit("512M") == 512 * 1024 ** 2
+    assert parse_memory_limit("2GiB") == 2 * 1024 ** 3
+    assert parse_memory_limit("1048576") == 1048576
@@ -0,0 +1,32 @@
+"""
+Regression tests for radix_sort
+"""
+
+import random
+
+from radix_sort import radix_sort_numbers, radix_topk
+
+def test_topk_keeps_ints_beyond_int64_exact():
+    values = [12345678901234567891, 12345678901234567890, 7]
+    assert radix_topk(values, 2) == [7, 12345678901234567890]
+    assert all(isinstance(value, int) for value in radix_topk(values, 2))
+
+def test_topk_matches_sorted():
+    rng = random.Random(0)
+    values = [rng.randint(-2**70, 2**70) for _ in range(2000)] + [2**63 + 5, 2**64 - 1]
+    assert radix_topk(values, 50) == sorted(values)[:50]
+
+    floats = [rng.uniform(-1e6, 1e6) for _ in range(2000)]
+    assert radix_topk(floats, 50) == sorted(floats)[:50]
+
+def test_sort_numbers_mixed_with_huge_ints_is_exact():
+    huge = 10 ** 400
+    values = [huge, 1.5, 2 ** 70 + 1, -2.5, 2 ** 70, 3] * 400
+    result = radix_sort_numbers(values)
+    assert result == sorted(values)
+    assert result[-1] == huge and isinstance(result[-1], int)
+
+def test_topk_mixed_with_huge_ints_matches_full_sort():
+    values = [10 ** 400, 1.5, 2 ** 70 + 1, -2.5, 2 ** 70, 3] * 400
+    assert radix_topk(values, 1000) == radix_sort_numbers(values)[:1000]
+    assert radix_topk([10 ** 400, 0.5, 7], 2) == [0.5, 7]
@@ -0,0 +1,26 @@
+"""
+Regression tests for result_cache
+"""
+
+from result_cache import ResultCache
+
+def test_set_reports_oversized_values():
+    cache = ResultCache(max_bytes=1000)
+    assert cache.set("key", "small")
+    assert not cache.set("key", "x" * 5000)
+    assert cache.get("key") == "small"
+
+def test_oversized_values_go_to_disk(tmp_path):
+    cache = ResultCache(max_bytes=1000, disk_dir=str(tmp_path))
+    assert cache.set("key", "x" * 5000)
+    assert cache.get("key") == "x" * 5000
+
+def test_shared_disk_dir_is_refused(tmp_path):
+    tmp_path.chmod(0o777)
+    assert ResultCache(disk_dir=str(tmp_path)).disk_dir is None
+
+def test_disk_entries_are_json(tmp_path):
+    cache = ResultCache(disk_dir=str(tmp_path))
+    cache.set("key", {"sorted_features": ["a", "b"], "feature_count": 2})
+    assert [path.suffix for path in tmp_path.iterdir()] == [".json"]
+    assert ResultCache(disk_dir=str(tmp_path)).get("key") == {"sorted_features": ["a", "b"], "feature_count": 2}
@@ -0,0 +1,16 @@
+"""
+Regression tests for sort_dispatcher
+"""
+
+from sort_dispatcher import adaptive_sort
+
+def test_strings_with_one_long_key_use_msd():
+    words = [f"w{i:05d}" for i in range(5000, 0, -1)] + ["x" * 2000]
+    result, strategy = adaptive_sort(words)
+    assert strategy == "msd_radix"
+    assert result == sorted(words)
+
+def test_trailing_nul_bytes_sort_after_prefix():
+    words = ["ab\x00", "b", "ab", "a", "ab\x00\x00"] * 100
+    result, _ = adaptive_sort(words)
+    assert result == sorted(words)
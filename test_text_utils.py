@@ -0,0 +1,15 @@
+"""
+Regression tests for text_utils
+"""
+
+from text_utils import iter_features
+
+def test_sentences_do_not_split_on_decimal_points():
+    text = "Temperature fell to -2.5 degrees. Then 3.14 is pi! Done."
+    assert list(iter_features(text, 'sentences', unique=False)) == [
+        "temperature fell to 25 degrees", "then 314 is pi", "done"
+    ]
+
+def test_decimal_point_across_chunks():
+    chunks = ["fell to -2.", "5 degrees. next one.\n"]
+    assert list(iter_features(chunks, 'sentences', unique=False)) == ["fell to 25 degrees", "next one"]
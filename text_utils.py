@@ -2,18 +2,18 @@
 Text processing utilities for NLP
 """
 
+import os
 import re
 import string
-from collections import Counter
-from summa import summarizer as text_rank_summarizer
-import nltk
-from nltk.tokenize import sent_tokenize
+from collections import Counter, deque
+from radix_sort import radix_sort_by_frequency
+from vocabulary import Vocabulary
+from result_cache import get_result_cache, make_key
+import textrank
+from worker_pool import get_worker_pool
+from download_nltk_data import configure_nltk_data
 
-# Download necessary NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# summa and nltk are imported on first use (see warm_up)
 
 def preprocess_text(text):
     """
@@ -37,52 +37,333 @@ def preprocess_text(text):
     
     return text
 
-import re  # Ensure regex is imported
+# Punctuation table and patterns shared by the streaming tokenizer
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+_TOKEN_PATTERN = re.compile(r'\S+')
+# A dot between two digits is a decimal point, not a sentence end; one at the
+# end of a chunk is kept so the match is carried over to the next chunk
+_SENTENCE_PATTERN = re.compile(r'(?:[^.!?]|(?<=\d)\.(?=\d|\Z))+')
+_DIGITS_PATTERN = re.compile(r'\d+')
+# Integers, decimals and scientific notation, with an optional minus sign
+_NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?')
 
-def extract_features(text, feature_type='words', n=2):
+FEATURE_TYPES = ('words', 'sentences', 'numbers', 'ngrams')
+
+# 'summa' is the dense TextRank package; 'textrank' is the sparse built-in one
+SUMMARY_ENGINES = ('summa', 'textrank')
+DEFAULT_SUMMARY_ENGINE = os.environ.get('NLP_SUMMARY_ENGINE', 'summa')
+
+# Texts longer than this many characters are summarized chunk by chunk
+SUMMARY_CHUNK_CHARS = int(os.environ.get('NLP_SUMMARY_CHUNK_CHARS', '20000'))
+
+def extract_numbers_from_text(text):
     """
-    Extract features from text.
+    Extract all numbers from text.
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        List of numbers found in the text
+    """
+    # Convert to integers or floats; floats are sorted exactly, without scaling
+    numbers = []
+    for num_str in _NUMBER_PATTERN.findall(text):
+        if num_str.lstrip('-').isdigit():
+            numbers.append(int(num_str))
+        else:
+            numbers.append(float(num_str))
+    
+    return numbers
 
+def format_number(num):
+    """
+    Format a number from extract_numbers_from_text for output.
+    
     Args:
-        text: Preprocessed text
-        feature_type: Type of features to extract ('words', 'sentences', 'numbers', or 'ngrams')
-        n: Size of n-grams if feature_type is 'ngrams'
+        num: Integer, float, or an already formatted string
+        
+    Returns:
+        Number as a string
+    """
+    if isinstance(num, float):
+        # Integers mixed into a float sort come back as integral floats
+        if num.is_integer() and abs(num) < 1e16:
+            return str(int(num))
+        return repr(num)
+    return str(num)
+
+def _iter_spans(source, pattern):
+    """
+    Yield the matches of pattern over a string or a stream of text chunks.
+    
+    A match that touches the end of a chunk may continue in the next one,
+    so it is carried over instead of being emitted in two pieces. Only that
+    unfinished tail is ever copied; the rest of each chunk is scanned in place.
+    
+    Args:
+        source: Text string or iterable of text chunks (e.g. file lines)
+        pattern: Compiled regex whose matches are the spans to yield
+        
+    Yields:
+        Matched substrings in document order
+    """
+    if isinstance(source, str):
+        source = (source,)
+    
+    carry = ""
+    for chunk in source:
+        if not chunk:
+            continue
+        text = carry + chunk if carry else chunk
+        carry = ""
+        for match in pattern.finditer(text):
+            if match.end() == len(text):
+                carry = match.group()
+            else:
+                yield match.group()
+    
+    if carry:
+        yield carry
+
+def _normalize_token(token):
+    """Lowercase a whitespace-delimited token and strip its punctuation."""
+    return token.lower().translate(_PUNCTUATION_TABLE)
 
+def iter_words(source):
+    """
+    Stream normalized words from raw text in a single pass.
+    
+    Produces the same words as preprocess_text(text).split(), without
+    building the lowercased, stripped and re-spaced copies of the document.
+    
+    Args:
+        source: Text string or iterable of text chunks
+        
+    Yields:
+        Lowercased words with punctuation removed
+    """
+    for token in _iter_spans(source, _TOKEN_PATTERN):
+        word = _normalize_token(token)
+        if word:
+            yield word
+
+def ngram_bounds(n):
+    """
+    Normalize an n-gram size or range.
+    
+    Args:
+        n: N-gram size, or a (min_n, max_n) pair for a range of sizes
+        
     Returns:
-        List of extracted features
+        (min_n, max_n) tuple
     """
-    features = []  # Ensure features is always initialized
+    if isinstance(n, int):
+        min_n = max_n = n
+    elif len(n) == 2:
+        min_n, max_n = n
+    else:
+        raise ValueError(f"Invalid n-gram range: {n} (expected [min_n, max_n])")
+    if min_n < 1 or max_n < min_n:
+        raise ValueError(f"Invalid n-gram range: {min_n}..{max_n}")
+    return min_n, max_n
 
-    if feature_type == 'words':
-        # Split text into words
-        features = text.split()
+def _iter_ngram_keys(source, n):
+    """
+    Slide a window over the words and yield each n-gram as token IDs.
+    
+    Args:
+        source: Text string or iterable of text chunks
+        n: N-gram size or (min_n, max_n) range
+        
+    Yields:
+        (ngram_key, vocabulary) pairs, where ngram_key is a tuple of token
+        IDs and vocabulary is the ID -> word list (shared and growing)
+    """
+    min_n, max_n = ngram_bounds(n)
+    token_ids = {}
+    vocabulary = []
+    window = deque(maxlen=max_n)
+    
+    for word in iter_words(source):
+        token_id = token_ids.get(word)
+        if token_id is None:
+            token_id = token_ids[word] = len(vocabulary)
+            vocabulary.append(word)
+        window.append(token_id)
+        if len(window) < min_n:
+            continue
+        
+        # Every n-gram in the range that ends at this word
+        current = tuple(window)
+        for size in range(min_n, len(current) + 1):
+            yield current[-size:], vocabulary
 
-    elif feature_type == 'sentences':
-        # Split text into sentences
-        features = re.split(r'[.!?]+', text)
-        features = [s.strip() for s in features if s.strip()]
+def iter_ngrams(source, n=2, unique=True):
+    """
+    Stream n-grams from text with a rolling window of token IDs.
+    
+    N-grams are compared as tuples of integer token IDs, so with unique=True
+    a joined string is only built the first time an n-gram is seen.
+    
+    Args:
+        source: Text string or iterable of text chunks
+        n: N-gram size, or a (min_n, max_n) pair to emit every size in the
+           range in one pass
+        unique: Whether to skip n-grams that were already emitted
+        
+    Yields:
+        Space-joined n-grams in order of (first) occurrence
+    """
+    seen = set()
+    for key, vocabulary in _iter_ngram_keys(source, n):
+        if unique:
+            if key in seen:
+                continue
+            seen.add(key)
+        yield ' '.join([vocabulary[token_id] for token_id in key])
 
-    elif feature_type == 'numbers':
-        # Extract numbers using regex
-        features = re.findall(r'\d+', text)  # Finds all numeric sequences
+def count_ngrams(source, n=2):
+    """
+    Count n-grams, building each joined string only once.
+    
+    Args:
+        source: Text string or iterable of text chunks
+        n: N-gram size or (min_n, max_n) range
+        
+    Returns:
+        Dictionary mapping n-gram -> count, in order of first occurrence
+    """
+    key_counts = Counter()
+    vocabulary = []
+    for key, vocabulary in _iter_ngram_keys(source, n):
+        key_counts[key] += 1
+    return Counter({
+        ' '.join([vocabulary[token_id] for token_id in key]): count
+        for key, count in key_counts.items()
+    })
 
+def _iter_all_features(source, feature_type, n):
+    """Yield every occurrence of a feature; see iter_features."""
+    if feature_type == 'words':
+        yield from iter_words(source)
+    
+    elif feature_type == 'sentences':
+        # Sentences are split on their terminators before normalization,
+        # which would otherwise strip the terminators away
+        for part in _iter_spans(source, _SENTENCE_PATTERN):
+            sentence = ' '.join(iter_words(part))
+            if sentence:
+                yield sentence
+    
+    elif feature_type == 'numbers':
+        for word in iter_words(source):
+            yield from _DIGITS_PATTERN.findall(word)
+    
     elif feature_type == 'ngrams':
-        # Generate n-grams
-        words = text.split()
-        features = [' '.join(words[i:i+n]) for i in range(len(words) - n + 1)]
-
+        yield from iter_ngrams(source, n, unique=False)
+    
     else:
         raise ValueError(f"Unknown feature_type: {feature_type}")
 
-    # Remove duplicates while preserving order
-    unique_features = []
+def iter_features(source, feature_type='words', n=2, unique=True):
+    """
+    Tokenize text and emit features in one streaming pass.
+    
+    Case folding, punctuation stripping, whitespace normalization, feature
+    emission and deduplication all happen per token, so memory grows with
+    the number of unique features rather than with copies of the document,
+    and consumers can start work before the input has been read in full.
+    
+    Args:
+        source: Raw or preprocessed text, or an iterable of text chunks
+        feature_type: Type of features to extract ('words', 'sentences', 'numbers', or 'ngrams')
+        n: Size of n-grams if feature_type is 'ngrams', or a (min_n, max_n) range
+        unique: Whether to skip features that were already emitted
+        
+    Yields:
+        Features in order of (first) occurrence
+    """
+    if feature_type not in FEATURE_TYPES:
+        raise ValueError(f"Unknown feature_type: {feature_type}")
+    
+    if feature_type == 'ngrams':
+        # N-grams are deduplicated on token IDs rather than joined strings
+        yield from iter_ngrams(source, n, unique)
+        return
+    
+    features = _iter_all_features(source, feature_type, n)
+    if not unique:
+        yield from features
+        return
+    
     seen = set()
     for feature in features:
         if feature not in seen:
             seen.add(feature)
-            unique_features.append(feature)
+            yield feature
+
+def split_features(text, feature_type='words', n=2):
+    """
+    Split text into features, keeping every occurrence.
+
+    Args:
+        text: Raw or preprocessed text
+        feature_type: Type of features to extract ('words', 'sentences', 'numbers', or 'ngrams')
+        n: Size of n-grams if feature_type is 'ngrams', or a (min_n, max_n) range
+
+    Returns:
+        List of features in document order, including duplicates
+    """
+    return list(iter_features(text, feature_type, n, unique=False))
+
+def extract_features(text, feature_type='words', n=2):
+    """
+    Extract features from text.
+
+    Args:
+        text: Raw or preprocessed text
+        feature_type: Type of features to extract ('words', 'sentences', 'numbers', or 'ngrams')
+        n: Size of n-grams if feature_type is 'ngrams', or a (min_n, max_n) range
+
+    Returns:
+        List of unique features in order of first occurrence
+    """
+    return list(iter_features(text, feature_type, n))
+
+def count_features(text, feature_type='words', n=2):
+    """
+    Count how often each feature occurs in the text.
+
+    Args:
+        text: Raw or preprocessed text
+        feature_type: Type of features to extract ('words', 'sentences', 'numbers', or 'ngrams')
+        n: Size of n-grams if feature_type is 'ngrams', or a (min_n, max_n) range
+
+    Returns:
+        Dictionary mapping feature -> count, in order of first occurrence
+    """
+    if feature_type == 'ngrams':
+        return count_ngrams(text, n)
+    return Counter(iter_features(text, feature_type, n, unique=False))
+
+def build_vocabulary(text, feature_type='words', n=2):
+    """
+    Tokenize text straight into an interned vocabulary with counts.
 
-    return unique_features
+    Args:
+        text: Raw text, or an iterable of text chunks
+        feature_type: Type of features to extract ('words', 'sentences', 'numbers', or 'ngrams')
+        n: Size of n-grams if feature_type is 'ngrams', or a (min_n, max_n) range
+
+    Returns:
+        Vocabulary with IDs in order of first occurrence
+    """
+    if feature_type == 'ngrams':
+        return Vocabulary.from_counts(count_ngrams(text, n))
+    vocabulary = Vocabulary()
+    vocabulary.update(iter_features(text, feature_type, n, unique=False))
+    return vocabulary
 
 def analyze_features(features):
     """
@@ -101,31 +382,106 @@ def analyze_features(features):
     stats = {
         'total_features': len(features),
         'unique_features': len(feature_counts),
-        'most_common': feature_counts.most_common(10)
+        'most_common': radix_sort_by_frequency(feature_counts, k=10)
     }
     
     return stats
 
-def summarize_text(text, ratio=0.2):
+def summarize_text(text, ratio=0.2, engine=None):
     """
     Generate a summary of the input text.
     
+    Summaries are cached by a hash of (text, ratio, engine), so repeated
+    requests for the same document (e.g. process, then export) run once.
+    
     Args:
         text: Input text to summarize
         ratio: Proportion of the original text to keep (0.0 to 1.0)
+        engine: 'summa' (dense TextRank) or 'textrank' (built-in sparse
+                TextRank); defaults to DEFAULT_SUMMARY_ENGINE
         
     Returns:
         Summarized text
     """
+    engine = engine or DEFAULT_SUMMARY_ENGINE
+    if engine not in SUMMARY_ENGINES:
+        raise ValueError(f"Unknown summary engine: {engine}")
+    
     if not text.strip():
         return ""
     
+    return get_result_cache().get_or_compute(
+        make_key("summary", text, ratio, engine), lambda: _summarize_uncached(text, ratio, engine)
+    )
+
+def _summarize_chunk(args):
+    """Pool task: summarize one chunk of a long document."""
+    chunk, ratio, engine = args
+    return _summarize_single(chunk, ratio, engine)
+
+def _summarize_uncached(text, ratio, engine):
+    """
+    Summarize text, with map-reduce over sentence-aligned chunks if it is long.
+    
+    Each chunk is summarized on the worker pool (sequentially when there is
+    none), so the quadratic part of TextRank is bounded by the chunk size
+    rather than the document size. Below a ratio of 0.5 the chunks keep twice
+    the requested ratio and the joined chunk summaries are reduced again at
+    0.5, recursively if they are still long, so the overall ratio is kept.
+    """
+    if len(text) <= SUMMARY_CHUNK_CHARS:
+        return _summarize_single(text, ratio, engine)
+    
+    chunks = textrank.sentence_chunks(text, SUMMARY_CHUNK_CHARS)
+    if len(chunks) < 2:
+        return _summarize_single(text, ratio, engine)
+    
+    map_ratio = min(1.0, 2 * ratio)
+    if map_ratio >= 1.0:
+        map_ratio = ratio
+    tasks = [(chunk, map_ratio, engine) for chunk in chunks]
+    pool = get_worker_pool()
+    if pool is not None:
+        chunk_summaries = pool.map(_summarize_chunk, tasks)
+    else:
+        chunk_summaries = [_summarize_chunk(task) for task in tasks]
+    
+    combined = "\n".join(summary for summary in chunk_summaries if summary.strip())
+    if map_ratio == ratio:
+        return combined
+    return _summarize_uncached(combined, ratio / map_ratio, engine)
+
+def split_into_sentences(text):
+    """
+    Split text into sentences with NLTK punkt, or a regex if it is not bundled.
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        List of sentences
+    """
+    if configure_nltk_data():
+        from nltk.tokenize import sent_tokenize
+        try:
+            return sent_tokenize(text)
+        except LookupError:
+            # e.g. punkt is bundled but this NLTK version wants punkt_tab
+            pass
+    return textrank.split_sentences(text)
+
+def _summarize_single(text, ratio, engine):
+    """Run TextRank, falling back to the leading sentences."""
     # Use TextRank algorithm for summarization
     try:
-        summary = text_rank_summarizer.summarize(text, ratio=ratio)
+        if engine == 'textrank':
+            summary = textrank.summarize(text, ratio=ratio)
+        else:
+            from summa import summarizer as text_rank_summarizer
+            summary = text_rank_summarizer.summarize(text, ratio=ratio)
         if not summary.strip():
             # Fallback to a simple extractive summary if TextRank fails
-            sentences = sent_tokenize(text)
+            sentences = split_into_sentences(text)
             if len(sentences) <= 3:
                 return text  # Text is already short enough
             
@@ -137,6 +493,28 @@ def summarize_text(text, ratio=0.2):
     except Exception as e:
         print(f"Summarization error: {e}")
         # Simple fallback - just return the first few sentences
-        sentences = sent_tokenize(text)
+        sentences = split_into_sentences(text)
         num_sentences = max(1, int(len(sentences) * ratio))
-        return " ".join(sentences[:num_sentences]) 
\ No newline at end of file
+        return " ".join(sentences[:num_sentences]) 
+
+def warm_up():
+    """
+    Load the summarizer and NLTK data ahead of the first request.
+    
+    Returns:
+        Dictionary mapping what was loaded -> seconds it took
+    """
+    import time
+    
+    timings = {}
+    start = time.perf_counter()
+    try:
+        import summa.summarizer
+        timings["summa"] = time.perf_counter() - start
+    except ImportError as e:
+        print(f"Warm-up could not import summa: {e}")
+    
+    start = time.perf_counter()
+    configure_nltk_data()
+    timings["nltk"] = time.perf_counter() - start
+    return timings
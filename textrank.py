@@ -0,0 +1,232 @@
+"""
+Built-in TextRank summarizer
+
+Scores sentences the way summa's TextRank does (shared words between two
+sentences, normalized by the log of their lengths, ranked with weighted
+PageRank) but never builds the dense sentence x sentence graph. Edges are
+found through an inverted index from terms to the sentences containing
+them, so only sentence pairs that actually share a term are ever looked
+at, and PageRank runs as a vectorized power iteration with an iteration
+cap and convergence tolerance.
+"""
+
+import math
+import re
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DAMPING = 0.85
+MAX_ITER = 100
+TOLERANCE = 1e-4
+
+# Terms found in more sentences than this are treated like stopwords:
+# pairing up all of their sentences would make the graph dense again
+MAX_TERM_SENTENCES = 500
+
+# Longer documents are summarized from an evenly spaced sample of sentences
+MAX_SENTENCES = 10000
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers herself him
+himself his how i if in into is it its itself just me more most my myself no nor
+not now of off on once only or other our ours ourselves out over own same she
+should so some such than that the their theirs them themselves then there these
+they this those through to too under until up very was we were what when where
+which while who whom why will with would you your yours yourself yourselves
+""".split())
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+_TERM_PATTERN = re.compile(r'\w+')
+
+def split_sentences(text):
+    """
+    Split text into sentences on terminators and blank lines.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of stripped, non-empty sentences
+    """
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+def sentence_chunks(text, chunk_chars):
+    """
+    Cut text into chunks of roughly chunk_chars, only at sentence boundaries.
+
+    Args:
+        text: Input text
+        chunk_chars: Target chunk size in characters
+
+    Returns:
+        List of chunks that together cover the text
+    """
+    chunks = []
+    start = 0
+    for boundary in _SENTENCE_BOUNDARY.finditer(text):
+        if boundary.start() - start >= chunk_chars:
+            chunks.append(text[start:boundary.start()])
+            start = boundary.end()
+    if text[start:].strip():
+        chunks.append(text[start:])
+    return chunks
+
+def _sentence_terms(sentence):
+    """Lowercased words of a sentence, without stopwords."""
+    return [term for term in _TERM_PATTERN.findall(sentence.lower()) if term not in STOPWORDS]
+
+def _overlap_counts(term_sets, max_term_sentences):
+    """
+    Count the distinct terms shared by every pair of sentences.
+
+    Args:
+        term_sets: List of sets of terms, one per sentence
+        max_term_sentences: Skip terms that occur in more sentences
+
+    Returns:
+        (pair_keys, overlaps): pair key i * n + j (i < j) and the number of
+        shared terms, as NumPy arrays or lists
+    """
+    n = len(term_sets)
+    index = {}
+    for sentence_id, terms in enumerate(term_sets):
+        for term in terms:
+            index.setdefault(term, []).append(sentence_id)
+    postings = [ids for ids in index.values() if 1 < len(ids) <= max_term_sentences]
+
+    if np is not None:
+        if not postings:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        keys = []
+        for ids in postings:
+            ids = np.asarray(ids, dtype=np.int64)
+            upper, lower = np.triu_indices(len(ids), 1)
+            keys.append(ids[upper] * n + ids[lower])
+        return np.unique(np.concatenate(keys), return_counts=True)
+
+    overlaps = Counter()
+    for ids in postings:
+        for a in range(len(ids)):
+            base = ids[a] * n
+            for b in range(a + 1, len(ids)):
+                overlaps[base + ids[b]] += 1
+    return list(overlaps), list(overlaps.values())
+
+def _pagerank_numpy(n, sources, targets, weights, damping, max_iter, tol):
+    """Weighted PageRank by power iteration over an edge list."""
+    out_weight = np.bincount(sources, weights=weights, minlength=n)
+    share = weights / out_weight[sources]
+    scores = np.ones(n)
+    for _ in range(max_iter):
+        previous = scores
+        scores = (1 - damping) + damping * np.bincount(targets, weights=share * previous[sources], minlength=n)
+        if np.abs(scores - previous).max() < tol:
+            break
+    return scores.tolist()
+
+def _pagerank_python(n, sources, targets, weights, damping, max_iter, tol):
+    """Pure Python fallback of _pagerank_numpy."""
+    out_weight = [0.0] * n
+    for source, weight in zip(sources, weights):
+        out_weight[source] += weight
+    shares = [weight / out_weight[source] for source, weight in zip(sources, weights)]
+    scores = [1.0] * n
+    for _ in range(max_iter):
+        incoming = [0.0] * n
+        for source, target, share in zip(sources, targets, shares):
+            incoming[target] += share * scores[source]
+        previous = scores
+        scores = [(1 - damping) + damping * value for value in incoming]
+        if max(abs(a - b) for a, b in zip(scores, previous)) < tol:
+            break
+    return scores
+
+def rank_sentences(sentences, damping=DAMPING, max_iter=MAX_ITER, tol=TOLERANCE,
+                   max_term_sentences=MAX_TERM_SENTENCES):
+    """
+    Score sentences with TextRank over a sparse similarity graph.
+
+    Args:
+        sentences: List of sentence strings
+        damping: PageRank damping factor
+        max_iter: Maximum number of power iterations
+        tol: Stop once no score changes by more than this
+        max_term_sentences: Ignore terms shared by more sentences than this
+
+    Returns:
+        List of scores, parallel to sentences
+    """
+    n = len(sentences)
+    if n == 0:
+        return []
+
+    term_lists = [_sentence_terms(sentence) for sentence in sentences]
+    term_sets = [set(terms) for terms in term_lists]
+    # Same normalization as summa: log10 of the sentence lengths
+    log_lengths = [math.log10(len(terms)) if terms else 0.0 for terms in term_lists]
+
+    keys, overlaps = _overlap_counts(term_sets, max_term_sentences)
+
+    if np is not None:
+        first, second = keys // n, keys % n
+        log_lengths = np.asarray(log_lengths)
+        norm = log_lengths[first] + log_lengths[second]
+        keep = norm > 0
+        first, second = first[keep], second[keep]
+        weights = overlaps[keep] / norm[keep]
+        if len(weights) == 0:
+            return [1.0] * n
+        # The graph is undirected: add both directions of every edge
+        sources = np.concatenate([first, second])
+        targets = np.concatenate([second, first])
+        weights = np.concatenate([weights, weights])
+        return _pagerank_numpy(n, sources, targets, weights, damping, max_iter, tol)
+
+    sources, targets, weights = [], [], []
+    for key, overlap in zip(keys, overlaps):
+        i, j = divmod(key, n)
+        norm = log_lengths[i] + log_lengths[j]
+        if norm > 0:
+            sources += [i, j]
+            targets += [j, i]
+            weights += [overlap / norm] * 2
+    if not weights:
+        return [1.0] * n
+    return _pagerank_python(n, sources, targets, weights, damping, max_iter, tol)
+
+def summarize(text, ratio=0.2, max_sentences=MAX_SENTENCES, **options):
+    """
+    Extract the highest ranked sentences of a text.
+
+    Like summa.summarizer.summarize, int(ratio * sentence count) sentences
+    are kept, in document order, joined by newlines.
+
+    Args:
+        text: Input text
+        ratio: Proportion of the sentences to keep (0.0 to 1.0)
+        max_sentences: Rank at most this many evenly spaced sentences
+        **options: Passed on to rank_sentences (damping, max_iter, tol, ...)
+
+    Returns:
+        Summary text (empty if no sentence would be kept)
+    """
+    sentences = split_sentences(text)
+    length = int(len(sentences) * ratio)
+    if length == 0:
+        return ""
+
+    candidates = list(range(len(sentences)))
+    if len(sentences) > max_sentences:
+        step = len(sentences) / max_sentences
+        candidates = [int(i * step) for i in range(max_sentences)]
+        length = max(1, int(max_sentences * ratio))
+
+    scores = rank_sentences([sentences[i] for i in candidates], **options)
+    best = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)[:length]
+    return "\n".join(sentences[candidates[i]] for i in sorted(best))
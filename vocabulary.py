@@ -0,0 +1,169 @@
+"""
+Interned feature vocabulary
+
+Each distinct feature is stored once and given a compact integer ID.
+Occurrence counts and sorted results are arrays of those IDs
+(4 bytes per entry) instead of lists of strings, and the strings are only
+materialized again when a response or report is built.
+"""
+
+from array import array
+
+from radix_sort import radix_sort_numeric, radix_topk, SORT_ORDERS
+from sort_dispatcher import adaptive_sort
+
+class Vocabulary:
+    """
+    Token -> ID mapping with per-ID occurrence counts.
+
+    Attributes:
+        tokens: List of features, indexed by ID
+        counts: array('I') of occurrence counts, indexed by ID
+    """
+
+    def __init__(self):
+        self.token_ids = {}
+        self.tokens = []
+        self.counts = array('I')
+        self._lexicographic = None
+
+    def __len__(self):
+        return len(self.tokens)
+
+    @classmethod
+    def from_counts(cls, counts):
+        """
+        Build a vocabulary from a feature -> count mapping.
+
+        Args:
+            counts: Dict mapping feature -> occurrence count
+
+        Returns:
+            Vocabulary with IDs assigned in the mapping's order
+        """
+        vocabulary = cls()
+        for token, count in counts.items():
+            vocabulary.add(token, count)
+        return vocabulary
+
+    def add(self, token, count=1):
+        """
+        Intern a feature and add to its count.
+
+        Args:
+            token: Feature string
+            count: Occurrences to add
+
+        Returns:
+            The feature's ID
+        """
+        token_id = self.token_ids.get(token)
+        if token_id is None:
+            token_id = self.token_ids[token] = len(self.tokens)
+            self.tokens.append(token)
+            self.counts.append(count)
+            self._lexicographic = None
+        else:
+            self.counts[token_id] += count
+        return token_id
+
+    def update(self, tokens):
+        """
+        Intern and count every feature of an iterable.
+
+        Args:
+            tokens: Iterable of feature strings (may be a generator)
+        """
+        token_ids = self.token_ids
+        counts = self.counts
+        for token in tokens:
+            token_id = token_ids.get(token)
+            if token_id is None:
+                self.add(token)
+            else:
+                counts[token_id] += 1
+
+    def _lexicographic_order(self):
+        """
+        Sort the vocabulary once and cache the result.
+
+        Returns:
+            (array of IDs in lexicographic order, strategy name)
+        """
+        if self._lexicographic is None:
+            sorted_tokens, strategy = adaptive_sort(self.tokens)
+            token_ids = self.token_ids
+            ids = array('I', [token_ids[token] for token in sorted_tokens])
+            self._lexicographic = (ids, strategy)
+        return self._lexicographic
+
+    def sorted_ids(self, sort_by="lexicographic", k=None):
+        """
+        Order the vocabulary without materializing any strings.
+
+        Frequency and length orders are single integer radix sorts over
+        composite keys (primary key * vocabulary size + lexicographic rank),
+        so ties are broken by the precomputed ranks rather than by
+        comparing strings.
+
+        Args:
+            sort_by: 'lexicographic', 'frequency' (count descending) or
+                     'length' (ascending), ties broken lexicographically
+            k: Only return the first k IDs (None for all)
+
+        Returns:
+            (array('I') of IDs, strategy name)
+        """
+        if sort_by not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort_by: {sort_by}")
+
+        size = len(self.tokens)
+        if size == 0:
+            return array('I'), "empty"
+
+        if sort_by == "lexicographic":
+            if k is not None and self._lexicographic is None:
+                token_ids = self.token_ids
+                top = radix_topk(self.tokens, k)
+                return array('I', [token_ids[token] for token in top]), "radix_topk"
+            ids, strategy = self._lexicographic_order()
+            return (ids if k is None else ids[:k]), strategy
+
+        ordered, _ = self._lexicographic_order()
+        if sort_by == "frequency":
+            top_count = max(self.counts)
+            keys = [(top_count - self.counts[token_id]) * size + rank
+                    for rank, token_id in enumerate(ordered)]
+        else:
+            tokens = self.tokens
+            keys = [len(tokens[token_id]) * size + rank
+                    for rank, token_id in enumerate(ordered)]
+
+        keys = radix_sort_numeric(keys) if k is None else radix_topk(keys, k)
+        return array('I', [ordered[key % size] for key in keys]), "multikey_radix"
+
+    def materialize(self, ids):
+        """
+        Turn IDs back into feature strings.
+
+        Args:
+            ids: Iterable of IDs
+
+        Returns:
+            List of features
+        """
+        tokens = self.tokens
+        return [tokens[token_id] for token_id in ids]
+
+    def counts_of(self, ids):
+        """
+        Look up the occurrence counts of IDs.
+
+        Args:
+            ids: Iterable of IDs
+
+        Returns:
+            List of counts
+        """
+        counts = self.counts
+        return [counts[token_id] for token_id in ids]
@@ -0,0 +1,81 @@
+"""
+Persistent worker pool for CPU-bound stages of the application.
+
+The pool is created lazily the first time a stage asks for it and is then
+reused for the lifetime of the process, so requests never pay the cost of
+starting worker processes. Large inputs such as PDF bytes are handed to
+the workers through multiprocessing.shared_memory blocks rather than
+being pickled into every task.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from multiprocessing import resource_tracker
+
+_pool = None
+# get_worker_pool is called from several request threads at once
+_pool_lock = threading.Lock()
+
+def get_worker_count():
+    """
+    Get the number of worker processes to run.
+
+    Returns:
+        Value of NLP_WORKER_PROCESSES if set, otherwise the CPU count
+    """
+    configured = int(os.environ.get("NLP_WORKER_PROCESSES", "0"))
+    return configured if configured > 0 else multiprocessing.cpu_count()
+
+def get_worker_pool():
+    """
+    Get the process-wide worker pool, creating it on first use.
+
+    Returns:
+        multiprocessing.Pool instance, or None if parallel work is not
+        possible (single core, or called from inside a worker process)
+    """
+    global _pool
+
+    if _pool is not None:
+        return _pool
+
+    # Pool workers are daemonic and cannot start children of their own
+    if multiprocessing.current_process().daemon:
+        return None
+
+    workers = get_worker_count()
+    if workers < 2:
+        return None
+
+    with _pool_lock:
+        # Another thread may have created it while this one waited
+        if _pool is not None:
+            return _pool
+
+        try:
+            # Start the tracker before forking so the workers share it instead of
+            # each starting their own and "cleaning up" blocks they only attached
+            resource_tracker.ensure_running()
+            _pool = multiprocessing.Pool(processes=workers)
+        except Exception as e:
+            print(f"Could not start worker pool: {e}")
+            return None
+        pool = _pool
+
+    atexit.register(shutdown_worker_pool)
+    return pool
+
+def shutdown_worker_pool():
+    """
+    Stop the worker pool if it is running.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            return
+        pool, _pool = _pool, None
+    pool.close()
+    pool.join()